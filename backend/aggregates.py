@@ -0,0 +1,62 @@
+from collections import namedtuple
+from typing import Dict, Iterable
+from .order import Order
+from .ordertable import to_cents
+
+AggregateSnapshot = namedtuple("AggregateSnapshot", ["revenue_cents", "status_counts", "items_sold", "revenue_by_hour"])
+Contribution = namedtuple("Contribution", ["status", "revenue_cents", "hour", "items"])
+
+
+class OrderAggregates:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.revenue_cents = 0
+        self.status_counts: Dict[str, int] = {}
+        self.items_sold: Dict[str, int] = {}
+        self.revenue_by_hour = [0] * 24
+        self.contributions: Dict[str, Contribution] = {}
+
+    def contribution(self, order: Order) -> Contribution:
+        if order.status != Order.COMPLETED:
+            return Contribution(order.status, 0, None, ())
+        completed = order.status_time(Order.COMPLETED) or order.created_at
+        items = tuple((item.name, item.quantity) for item in order.items)
+        return Contribution(order.status, to_cents(order.get_total()), completed.hour, items)
+
+    def add(self, contribution: Contribution, sign: int):
+        self.status_counts[contribution.status] = self.status_counts.get(contribution.status, 0) + sign
+        if not self.status_counts[contribution.status]:
+            del self.status_counts[contribution.status]
+        if contribution.hour is None:
+            return
+        self.revenue_cents += sign * contribution.revenue_cents
+        self.revenue_by_hour[contribution.hour] += sign * contribution.revenue_cents
+        for name, quantity in contribution.items:
+            self.items_sold[name] = self.items_sold.get(name, 0) + sign * quantity
+            if not self.items_sold[name]:
+                del self.items_sold[name]
+
+    def apply(self, order: Order):
+        contribution = self.contribution(order)
+        previous = self.contributions.get(order.order_id)
+        if previous == contribution:
+            return
+        if previous is not None:
+            self.add(previous, -1)
+        self.add(contribution, 1)
+        self.contributions[order.order_id] = contribution
+
+    def apply_all(self, orders: Iterable[Order]):
+        for order in orders:
+            self.apply(order)
+
+    def rebuild(self, orders: Iterable[Order]):
+        self.reset()
+        self.apply_all(orders)
+
+    def snapshot(self) -> AggregateSnapshot:
+        return AggregateSnapshot(self.revenue_cents, dict(self.status_counts),
+                                 dict(self.items_sold), list(self.revenue_by_hour))
+
@@ -0,0 +1,161 @@
+import argparse
+import sys
+from datetime import date, datetime
+from typing import Dict, List, Tuple
+from .order import Order, get_order_store
+from .ordertable import OrderTable, STATUSES, STATUS_CODES
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+ANALYTICS_AVAILABLE = np is not None
+PAIRING_CHUNK = 65536
+OFFSET_SLOT_SECONDS = 900
+
+
+def column(values) -> "np.ndarray":
+    return np.frombuffer(values, dtype=values.typecode).astype(np.int64)
+
+
+def local_hours(timestamps) -> "np.ndarray":
+    # utc offsets only change on quarter-hour boundaries, so each distinct slot is looked up once and broadcast
+    slots, inverse = np.unique(timestamps // OFFSET_SLOT_SECONDS, return_inverse=True)
+    offsets = np.array([datetime.fromtimestamp(slot * OFFSET_SLOT_SECONDS).astimezone().utcoffset().total_seconds()
+                        for slot in slots.tolist()], dtype=np.float64)
+    return ((timestamps + offsets[inverse]) // 3600 % 24).astype(np.int64)
+
+
+class OrderAnalytics:
+    def __init__(self, table: OrderTable):
+        if np is None:
+            raise RuntimeError("numpy is required for order analytics (pip install numpy)")
+        self.product_names = list(table.product_names)
+        self.order_count = len(table)
+
+        self.created_at = np.frombuffer(table.created_at, dtype=np.float64)
+        self.hours = local_hours(self.created_at)
+        self.status_codes = column(table.status_codes)
+        self.total_cents = column(table.total_cents)
+        self.customers, self.customer_codes = np.unique(np.array(table.customer_ids, dtype=object),
+                                                        return_inverse=True)
+
+        self.item_orders = np.repeat(np.arange(self.order_count), np.diff(column(table.item_offsets)))
+        self.item_products = column(table.item_products)
+        self.item_quantities = column(table.item_quantities)
+        self.item_cents = column(table.item_price_cents) * self.item_quantities
+        self.basket_sizes = np.bincount(self.item_orders, weights=self.item_quantities, minlength=self.order_count)
+
+    def status_mask(self, status: str = Order.COMPLETED):
+        return self.status_codes == STATUS_CODES[status]
+
+    def item_mask(self, status: str = Order.COMPLETED):
+        return self.status_mask(status)[self.item_orders]
+
+    def revenue_by_hour(self) -> List[float]:
+        mask = self.status_mask()
+        cents = np.bincount(self.hours[mask], weights=self.total_cents[mask], minlength=24)
+        return (cents / 100).tolist()
+
+    def status_counts(self) -> Dict[str, int]:
+        counts = np.bincount(self.status_codes, minlength=len(STATUSES))
+        return {status: int(counts[code]) for code, status in enumerate(STATUSES) if counts[code]}
+
+    def top_items(self, n: int = 5, by: str = "quantity") -> List[Tuple[str, float]]:
+        mask = self.item_mask()
+        weights = self.item_quantities[mask] if by == "quantity" else self.item_cents[mask] / 100
+        totals = np.bincount(self.item_products[mask], weights=weights, minlength=len(self.product_names))
+        ranked = np.argsort(totals)[::-1][:n]
+        return [(self.product_names[code], float(totals[code])) for code in ranked if totals[code]]
+
+    def item_pairings(self, n: int = 5) -> List[Tuple[str, str, int]]:
+        products = len(self.product_names)
+        if not products:
+            return []
+        mask = self.item_mask()
+        item_orders, item_products = self.item_orders[mask], self.item_products[mask]
+
+        # order x product incidence, built in slices so memory stays flat on long histories
+        together = np.zeros((products, products), dtype=np.int64)
+        for start in range(0, self.order_count, PAIRING_CHUNK):
+            rows = (item_orders >= start) & (item_orders < start + PAIRING_CHUNK)
+            incidence = np.zeros((min(PAIRING_CHUNK, self.order_count - start), products), dtype=np.int32)
+            incidence[item_orders[rows] - start, item_products[rows]] = 1
+            together += incidence.T @ incidence
+        first, second = np.triu_indices(products, k=1)
+        counts = together[first, second]
+        ranked = np.argsort(counts)[::-1][:n]
+        return [
+            (self.product_names[first[i]], self.product_names[second[i]], int(counts[i]))
+            for i in ranked if counts[i]
+        ]
+
+    def basket_size_by_customer(self) -> Dict[str, float]:
+        mask = self.status_mask()
+        codes = self.customer_codes[mask]
+        orders = np.bincount(codes, minlength=len(self.customers))
+        items = np.bincount(codes, weights=self.basket_sizes[mask], minlength=len(self.customers))
+        return {
+            str(self.customers[code]): float(items[code] / orders[code])
+            for code in np.flatnonzero(orders)
+        }
+
+    def order_value_histogram(self, bins: int = 10) -> List[Tuple[float, float, int]]:
+        values = self.total_cents[self.status_mask()] / 100
+        if not len(values):
+            return []
+        counts, edges = np.histogram(values, bins=bins)
+        return [(float(edges[i]), float(edges[i + 1]), int(counts[i])) for i in range(len(counts))]
+
+
+def load_analytics(archive_range=None) -> OrderAnalytics:
+    store = get_order_store()
+    records = [o.to_dict() for o in store.hot_orders()]
+    if archive_range is not None:
+        records.extend(store.archive.load_records(*archive_range))
+    return OrderAnalytics(OrderTable.from_records(records))
+
+
+def format_report(analytics: OrderAnalytics) -> str:
+    lines = [f"Orders: {analytics.order_count}"]
+    lines.append("Status: " + ", ".join(f"{s} {c}" for s, c in analytics.status_counts().items()))
+
+    lines.append("\nRevenue by hour of day:")
+    for hour, revenue in enumerate(analytics.revenue_by_hour()):
+        if revenue:
+            lines.append(f"  {hour:02d}:00  ${revenue:,.2f}")
+
+    lines.append("\nTop items:")
+    for name, quantity in analytics.top_items(by="quantity"):
+        lines.append(f"  {name:<24} {int(quantity)} sold")
+
+    lines.append("\nItem pairings:")
+    for first, second, count in analytics.item_pairings():
+        lines.append(f"  {first} + {second}: {count} orders")
+
+    lines.append("\nAverage basket size by table:")
+    for customer, size in sorted(analytics.basket_size_by_customer().items()):
+        lines.append(f"  {customer:<24} {size:.1f} items")
+
+    lines.append("\nOrder value histogram:")
+    for low, high, count in analytics.order_value_histogram():
+        lines.append(f"  ${low:>8.2f} - ${high:>8.2f}  {count}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SmartChef order history report.")
+    parser.add_argument("--start", type=date.fromisoformat, default=date.today(), help="first day (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, default=date.today(), help="last day (YYYY-MM-DD)")
+    args = parser.parse_args(argv)
+
+    if not ANALYTICS_AVAILABLE:
+        print("numpy is required for order analytics (pip install numpy)")
+        return 1
+    print(format_report(load_analytics((args.start, args.end))))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
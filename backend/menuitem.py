@@ -2,6 +2,8 @@ import json
 import os
 
 class MenuItem:
+    __slots__ = ("id", "name", "category", "price")
+
     def __init__(self, id: str, name: str, category: str, price: float):
         self.id = id
         self.name = name
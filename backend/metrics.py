@@ -0,0 +1,107 @@
+from bisect import bisect_left
+from typing import Dict, Iterable, Optional
+from .order import Order
+
+# upper bounds in seconds; anything slower lands in the overflow bucket
+BUCKET_BOUNDS = [15, 30, 60, 120, 180, 300, 420, 600, 900, 1200, 1800, 2700, 3600]
+PERCENTILES = (50, 95, 99)
+
+WAIT = "wait"
+PREP = "prep"
+
+
+class Histogram:
+    __slots__ = ("counts", "total", "max_value")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.total = 0
+        self.max_value = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.total += 1
+        self.max_value = max(self.max_value, seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        if not self.total:
+            return None
+        rank = p / 100 * self.total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                bound = BUCKET_BOUNDS[i] if i < len(BUCKET_BOUNDS) else self.max_value
+                return min(bound, self.max_value)
+        return self.max_value
+
+    def percentiles(self) -> Dict[int, Optional[float]]:
+        return {p: self.percentile(p) for p in PERCENTILES}
+
+
+class KitchenMetrics:
+    def __init__(self):
+        self.histograms: Dict[tuple, Histogram] = {}
+        self.observed = set()
+
+    def reset(self):
+        self.histograms = {}
+        self.observed = set()
+
+    def histogram(self, metric: str, key=None) -> Histogram:
+        hist = self.histograms.get((metric, key))
+        if hist is None:
+            hist = self.histograms[(metric, key)] = Histogram()
+        return hist
+
+    def observe(self, metric: str, order_id: str, seconds: float, hour: int, item_names):
+        if (order_id, metric) in self.observed or seconds < 0:
+            return
+        self.observed.add((order_id, metric))
+        self.histogram(metric).observe(seconds)
+        self.histogram(metric, ("hour", hour)).observe(seconds)
+        for name in item_names:
+            self.histogram(metric, ("item", name)).observe(seconds)
+
+    def observe_order(self, order: Order):
+        pending = order.status_time(Order.PENDING)
+        if pending is None:
+            return
+        started = order.status_time(Order.PROCESSING)
+        completed = order.status_time(Order.COMPLETED)
+        names = {item.name for item in order.items}
+
+        picked_up = started or completed
+        if picked_up is not None:
+            self.observe(WAIT, order.order_id, (picked_up - pending).total_seconds(), pending.hour, names)
+        if started is not None and completed is not None:
+            self.observe(PREP, order.order_id, (completed - started).total_seconds(), pending.hour, names)
+
+    def observe_orders(self, orders: Iterable[Order]):
+        for order in orders:
+            self.observe_order(order)
+
+    def summary(self, metric: str, key=None) -> Dict[int, Optional[float]]:
+        hist = self.histograms.get((metric, key))
+        return hist.percentiles() if hist else {p: None for p in PERCENTILES}
+
+    def breakdown(self, metric: str, kind: str) -> Dict:
+        return {
+            key[1]: hist.percentiles()
+            for (name, key), hist in self.histograms.items()
+            if name == metric and key is not None and key[0] == kind
+        }
+
+    def by_hour(self, metric: str) -> Dict[int, Dict[int, Optional[float]]]:
+        return dict(sorted(self.breakdown(metric, "hour").items()))
+
+    def by_item(self, metric: str) -> Dict[str, Dict[int, Optional[float]]]:
+        return self.breakdown(metric, "item")
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "--"
+    if seconds < 60:
+        return f"{int(seconds)}s"
+    return f"{int(seconds // 60)}m"
@@ -0,0 +1,119 @@
+from array import array
+from datetime import datetime
+from typing import Dict, Iterable, List
+from .order import Order
+
+STATUSES = [Order.DRAFT, Order.PENDING, Order.PROCESSING, Order.COMPLETED, Order.CANCELLED]
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+
+def to_cents(amount: float) -> int:
+    return int(round(amount * 100))
+
+
+def prep_seconds(status_times: Dict[str, str]) -> float:
+    started = status_times.get(Order.PROCESSING)
+    completed = status_times.get(Order.COMPLETED)
+    if not started or not completed:
+        return -1.0
+    return (datetime.fromisoformat(completed) - datetime.fromisoformat(started)).total_seconds()
+
+
+class OrderTable:
+    def __init__(self):
+        self.order_ids: List[str] = []
+        self.customer_ids: List[str] = []
+        self.status_codes = array("b")
+        self.created_at = array("d")
+        self.total_cents = array("q")
+        self.prep_seconds = array("d")
+
+        self.item_offsets = array("q", [0])
+        self.item_products = array("l")
+        self.item_quantities = array("l")
+        self.item_price_cents = array("q")
+
+        self.product_ids: List[str] = []
+        self.product_names: List[str] = []
+        self._product_codes: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.order_ids)
+
+    @classmethod
+    def from_orders(cls, orders: Iterable[Order]) -> "OrderTable":
+        return cls.from_records(order.to_dict() for order in orders)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> "OrderTable":
+        table = cls()
+        for data in records:
+            table.append_record(data)
+        return table
+
+    def product_code(self, product_id: str, name: str) -> int:
+        code = self._product_codes.get(product_id)
+        if code is None:
+            code = len(self.product_ids)
+            self._product_codes[product_id] = code
+            self.product_ids.append(product_id)
+            self.product_names.append(name)
+        return code
+
+    def append(self, order: Order):
+        self.append_record(order.to_dict())
+
+    def append_record(self, data: Dict):
+        total = 0
+        for item in data["items"]:
+            price_cents = to_cents(item["price"])
+            self.item_products.append(self.product_code(item["product_id"], item["name"]))
+            self.item_quantities.append(item["quantity"])
+            self.item_price_cents.append(price_cents)
+            total += price_cents * item["quantity"]
+
+        self.order_ids.append(data["order_id"])
+        self.customer_ids.append(data["customer_id"])
+        self.status_codes.append(STATUS_CODES[data["status"]])
+        self.created_at.append(datetime.fromisoformat(data["created_at"]).timestamp())
+        self.total_cents.append(total)
+        self.prep_seconds.append(prep_seconds(data.get("status_times") or {}))
+        self.item_offsets.append(len(self.item_products))
+
+    def status(self, index: int) -> str:
+        return STATUSES[self.status_codes[index]]
+
+    def item_range(self, index: int) -> range:
+        return range(self.item_offsets[index], self.item_offsets[index + 1])
+
+    def order_size(self, index: int) -> int:
+        return sum(self.item_quantities[self.item_offsets[index]:self.item_offsets[index + 1]])
+
+    def revenue_cents(self, status: str = Order.COMPLETED) -> int:
+        code = STATUS_CODES[status]
+        return sum(total for total, status_code in zip(self.total_cents, self.status_codes) if status_code == code)
+
+    def count_by_status(self) -> Dict[str, int]:
+        counts = [0] * len(STATUSES)
+        for code in self.status_codes:
+            counts[code] += 1
+        return {status: counts[code] for code, status in enumerate(STATUSES) if counts[code]}
+
+    def product_line_counts(self) -> Dict[str, int]:
+        counts = [0] * len(self.product_ids)
+        for code in self.item_products:
+            counts[code] += 1
+        return self.by_product_name(counts)
+
+    def product_quantities(self) -> Dict[str, int]:
+        quantities = [0] * len(self.product_ids)
+        for code, quantity in zip(self.item_products, self.item_quantities):
+            quantities[code] += quantity
+        return self.by_product_name(quantities)
+
+    def by_product_name(self, values) -> Dict[str, int]:
+        totals = {}
+        for code, value in enumerate(values):
+            name = self.product_names[code]
+            totals[name] = totals.get(name, 0) + value
+        return totals
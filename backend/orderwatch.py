@@ -0,0 +1,99 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+from typing import Callable, List
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+EVENT_HEADER = struct.Struct("iIII")
+POLL_INTERVAL = 0.5
+SETTLE_DELAY = 0.02
+
+
+class FileWatcher:
+    def __init__(self, on_change: Callable[[], None]):
+        self.on_change = on_change
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name=type(self).__name__, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+
+    def run(self):
+        raise NotImplementedError
+
+
+class PollingWatcher(FileWatcher):
+    def __init__(self, on_change: Callable[[], None], interval: float = POLL_INTERVAL):
+        super().__init__(on_change)
+        self.interval = interval
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.on_change()
+
+
+class InotifyWatcher(FileWatcher):
+    def __init__(self, paths: List[str], on_change: Callable[[], None]):
+        super().__init__(on_change)
+        self.directory = os.path.dirname(os.path.abspath(paths[0]))
+        self.names = {os.path.basename(path) for path in paths}
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, self.directory.encode(), WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {self.directory}")
+
+    def changed_names(self, data: bytes):
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            _, _, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            yield data[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+            offset += length
+
+    def read_changes(self) -> bool:
+        try:
+            data = os.read(self.fd, 4096)
+        except BlockingIOError:
+            return False
+        return any(name in self.names for name in self.changed_names(data))
+
+    def run(self):
+        try:
+            while not self.stopped.is_set():
+                ready, _, _ = select.select([self.fd], [], [], 1.0)
+                if not ready or not self.read_changes():
+                    continue
+                # let the writer finish its commit and fold bursts into one notification
+                while select.select([self.fd], [], [], SETTLE_DELAY)[0]:
+                    self.read_changes()
+                self.on_change()
+        finally:
+            os.close(self.fd)
+
+
+def create_watcher(paths: List[str], on_change: Callable[[], None]) -> FileWatcher:
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(paths, on_change)
+        except (OSError, AttributeError) as e:
+            print(f"inotify unavailable, falling back to polling: {e}")
+    return PollingWatcher(on_change)
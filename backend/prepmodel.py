@@ -0,0 +1,142 @@
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List
+from .order import Order, OrderStore, get_order_store, parse_json_lines
+from .ordertable import OrderTable, prep_seconds
+from .scheduler import default_prep_estimate
+
+MAX_SIZE_BUCKET = 10
+MODEL_FILE_NAME = "prepmodel.json"
+
+_build_lock = threading.Lock()
+
+
+class PrepModel:
+    def __init__(self):
+        self.items: Dict[str, List[float]] = {}
+        self.sizes: Dict[int, List[float]] = {}
+        self.observed = set()
+
+    @staticmethod
+    def size_bucket(size: int) -> int:
+        return min(size, MAX_SIZE_BUCKET)
+
+    def add_sample(self, product_ids: Iterable[str], size: int, seconds: float):
+        for product_id in set(product_ids):
+            stats = self.items.setdefault(product_id, [0, 0.0])
+            stats[0] += 1
+            stats[1] += seconds
+        stats = self.sizes.setdefault(self.size_bucket(size), [0, 0.0])
+        stats[0] += 1
+        stats[1] += seconds
+
+    def fit(self, table: OrderTable) -> "PrepModel":
+        products, offsets = table.item_products, table.item_offsets
+        for index, seconds in enumerate(table.prep_seconds):
+            if seconds < 0:
+                continue
+            codes = products[offsets[index]:offsets[index + 1]]
+            self.add_sample((table.product_ids[code] for code in codes), table.order_size(index), seconds)
+        return self
+
+    def merge(self, other: "PrepModel"):
+        for target, source in ((self.items, other.items), (self.sizes, other.sizes)):
+            for key, (count, total) in source.items():
+                stats = target.setdefault(key, [0, 0.0])
+                stats[0] += count
+                stats[1] += total
+
+    def observe_order(self, order: Order):
+        if order.status != Order.COMPLETED or order.order_id in self.observed:
+            return
+        seconds = prep_seconds(order.status_times)
+        if seconds < 0:
+            return
+        self.observed.add(order.order_id)
+        self.add_sample((item.product_id for item in order.items), sum(item.quantity for item in order.items), seconds)
+
+    def observe_orders(self, orders: Iterable[Order]):
+        for order in orders:
+            self.observe_order(order)
+
+    def item_estimate(self, product_id: str):
+        stats = self.items.get(product_id)
+        return stats[1] / stats[0] if stats else None
+
+    def size_estimate(self, size: int):
+        stats = self.sizes.get(self.size_bucket(size))
+        return stats[1] / stats[0] if stats else None
+
+    def estimate(self, order: Order) -> float:
+        items = order.items
+        estimates = [self.item_estimate(item.product_id) for item in items]
+        estimates.append(self.size_estimate(sum(item.quantity for item in items)))
+        known = [e for e in estimates if e is not None]
+        return max(known) if known else default_prep_estimate(order)
+
+    def ready_time(self, order: Order) -> datetime:
+        start = order.status_time(Order.PROCESSING) or order.status_time(Order.PENDING) or datetime.now()
+        return start + timedelta(seconds=self.estimate(order))
+
+    def to_dict(self):
+        return {"items": self.items, "sizes": {str(size): stats for size, stats in self.sizes.items()}}
+
+    @classmethod
+    def from_dict(cls, data) -> "PrepModel":
+        model = cls()
+        model.items = {key: list(stats) for key, stats in data.get("items", {}).items()}
+        model.sizes = {int(key): list(stats) for key, stats in data.get("sizes", {}).items()}
+        return model
+
+
+def fit_day(path: str):
+    with open(path, "rb") as f:
+        records, consumed = parse_json_lines(f.read())
+    return PrepModel().fit(OrderTable.from_records(records)), consumed
+
+def load_day_models(path: str) -> Dict:
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_day_models(path: str, day_models: Dict):
+    # written aside and swapped in, so other terminals reading the cache never see a half-written file
+    temp_file = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_file, "w") as f:
+            json.dump(day_models, f)
+        os.replace(temp_file, path)
+    except OSError as e:
+        print(f"Error saving prep model: {e}")
+
+def build_prep_model(store: OrderStore = None) -> PrepModel:
+    with _build_lock:
+        return rebuild_prep_model(store or get_order_store())
+
+def rebuild_prep_model(store: OrderStore) -> PrepModel:
+    archive = store.archive
+    path = os.path.join(archive.directory, MODEL_FILE_NAME)
+    cached = load_day_models(path)
+
+    # archive days only ever grow, so a day whose file size is unchanged keeps its fitted sums
+    day_models = {}
+    model = PrepModel()
+    for day in archive.days():
+        key = day.isoformat()
+        day_file = archive.day_file(day)
+        entry = cached.get(key)
+        if entry is None or entry["size"] != os.path.getsize(day_file):
+            day_model, size = fit_day(day_file)
+            entry = {"size": size, "model": day_model.to_dict()}
+        else:
+            day_model = PrepModel.from_dict(entry["model"])
+        day_models[key] = entry
+        model.merge(day_model)
+
+    if day_models != cached:
+        save_day_models(path, day_models)
+    return model
@@ -0,0 +1,125 @@
+import argparse
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Dict, List
+from .order import Order, OrderArchive, get_order_store, read_archive_day
+from .ordertable import to_cents
+
+TAX_RATE = 0.08
+TASKS_PER_WORKER = 4
+
+
+class ReportTotals:
+    __slots__ = ("days", "orders", "status_counts", "revenue_cents", "tax_cents", "items")
+
+    def __init__(self):
+        self.days = 0
+        self.orders = 0
+        self.status_counts: Dict[str, int] = {}
+        self.revenue_cents = 0
+        self.tax_cents = 0
+        self.items: Dict[str, List[int]] = {}
+
+    def add_order(self, data: Dict):
+        status = data["status"]
+        self.orders += 1
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        if status != Order.COMPLETED:
+            return
+
+        subtotal = 0
+        for item in data["items"]:
+            cents = to_cents(item["price"]) * item["quantity"]
+            subtotal += cents
+            tally = self.items.setdefault(item["name"], [0, 0])
+            tally[0] += item["quantity"]
+            tally[1] += cents
+        self.revenue_cents += subtotal
+        self.tax_cents += round(subtotal * TAX_RATE)
+
+    def merge(self, other: "ReportTotals"):
+        self.days += other.days
+        self.orders += other.orders
+        self.revenue_cents += other.revenue_cents
+        self.tax_cents += other.tax_cents
+        for status, count in other.status_counts.items():
+            self.status_counts[status] = self.status_counts.get(status, 0) + count
+        for name, (quantity, cents) in other.items.items():
+            tally = self.items.setdefault(name, [0, 0])
+            tally[0] += quantity
+            tally[1] += cents
+
+    def top_items(self, n: int = 10):
+        return sorted(self.items.items(), key=lambda entry: entry[1][1], reverse=True)[:n]
+
+
+def report_day(path: str) -> ReportTotals:
+    totals = ReportTotals()
+    records = read_archive_day(path)
+    totals.days = 1 if records else 0
+    for data in records:
+        totals.add_order(data)
+    return totals
+
+
+def run_report(start: date, end: date, archive: OrderArchive = None, workers: int = None) -> ReportTotals:
+    archive = archive or get_order_store().archive
+    paths = [archive.day_file(day) for day in archive.days() if start <= day <= end]
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+
+    totals = ReportTotals()
+    if workers <= 1:
+        for part in map(report_day, paths):
+            totals.merge(part)
+        return totals
+
+    chunksize = max(1, len(paths) // (workers * TASKS_PER_WORKER))
+    # spawned workers, because forking the threaded Tk app can deadlock on locks held by other threads
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        for part in pool.map(report_day, paths, chunksize=chunksize):
+            totals.merge(part)
+    return totals
+
+
+def format_report(totals: ReportTotals, start: date, end: date) -> str:
+    completed = totals.status_counts.get(Order.COMPLETED, 0)
+    revenue = totals.revenue_cents / 100
+    tax = totals.tax_cents / 100
+    avg_order = revenue / completed if completed else 0
+
+    lines = [f"Report: {start.isoformat()} to {end.isoformat()} ({totals.days} days with orders)"]
+    lines.append(f"Orders: {totals.orders}")
+    lines.append("Status: " + ", ".join(f"{s} {c}" for s, c in sorted(totals.status_counts.items())))
+    lines.append(f"\n{'Subtotal:':<20} ${revenue:>12,.2f}")
+    lines.append(f"{f'Tax ({TAX_RATE*100:.1f}%):':<20} ${tax:>12,.2f}")
+    lines.append(f"{'Total:':<20} ${revenue + tax:>12,.2f}")
+    lines.append(f"{'Avg Order Value:':<20} ${avg_order:>12,.2f}")
+
+    lines.append("\nTop items:")
+    for name, (quantity, cents) in totals.top_items():
+        lines.append(f"  {name:<24} {quantity:>6} sold  ${cents / 100:>10,.2f}")
+    return "\n".join(lines)
+
+
+def month_range(today: date = None):
+    today = today or date.today()
+    return today.replace(day=1), today
+
+
+def main(argv=None):
+    first, last = month_range()
+    parser = argparse.ArgumentParser(description="SmartChef archived order report.")
+    parser.add_argument("--start", type=date.fromisoformat, default=first, help="first day (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, default=last, help="last day (YYYY-MM-DD)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    print(format_report(run_report(args.start, args.end, workers=args.workers), args.start, args.end))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+import os
+import sqlite3
+import threading
+from collections import namedtuple
+from datetime import date, timedelta
+from typing import Dict, List
+from .order import Order, OrderArchive, get_order_store, latest_records, parse_json_lines, ensure_data_dir
+from .ordertable import to_cents
+
+ROLLUP_FILE = "data/rollups.db"
+
+HOUR = "hour"
+DAY = "day"
+WEEK = "week"
+MONTH = "month"
+
+STATUS = "status"
+ITEM = "item"
+
+# week and month series are grouped out of the daily buckets
+SERIES_BUCKETS = {
+    HOUR: (HOUR, "bucket"),
+    DAY: (DAY, "bucket"),
+    WEEK: (DAY, "strftime('%Y-W%W', bucket)"),
+    MONTH: (DAY, "substr(bucket, 1, 7)"),
+}
+
+RollupSummary = namedtuple("RollupSummary", ["status_counts", "revenue_cents", "items_sold"])
+SeriesPoint = namedtuple("SeriesPoint", ["bucket", "orders", "revenue_cents"])
+
+
+def order_rows(data: Dict) -> List[tuple]:
+    created = data["created_at"]
+    buckets = ((HOUR, created[:13]), (DAY, created[:10]))
+    items = data["items"]
+    total = sum(to_cents(item["price"]) * item["quantity"] for item in items)
+
+    rows = []
+    for granularity, bucket in buckets:
+        rows.append((granularity, bucket, STATUS, data["status"], 1, 0, total))
+        if data["status"] != Order.COMPLETED:
+            continue
+        for item in items:
+            rows.append((granularity, bucket, ITEM, item["name"], 1, item["quantity"],
+                         to_cents(item["price"]) * item["quantity"]))
+    return rows
+
+
+class RollupStore:
+    def __init__(self, filename: str = ROLLUP_FILE, archive: OrderArchive = None):
+        self.filename = filename
+        self.archive = archive or get_order_store().archive
+        self.lock = threading.Lock()
+        ensure_data_dir()
+        self.conn = sqlite3.connect(filename, timeout=10, check_same_thread=False)
+        self.create_schema()
+
+    def create_schema(self):
+        with self.conn:
+            tracked = self.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'rollup_orders'"
+            ).fetchone()
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS rollups (
+                    granularity TEXT NOT NULL,
+                    bucket TEXT NOT NULL,
+                    dimension TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    orders INTEGER NOT NULL DEFAULT 0,
+                    quantity INTEGER NOT NULL DEFAULT 0,
+                    revenue_cents INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (granularity, bucket, dimension, key)
+                )
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS rollup_sources (
+                    day TEXT PRIMARY KEY,
+                    inode INTEGER NOT NULL,
+                    offset INTEGER NOT NULL
+                )
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS rollup_orders (
+                    day TEXT NOT NULL,
+                    order_id TEXT NOT NULL,
+                    PRIMARY KEY (day, order_id)
+                )
+            """)
+            # rollups built before order ids were tracked can't be deduped, so they are rebuilt
+            if not tracked:
+                self.conn.execute("DELETE FROM rollups")
+                self.conn.execute("DELETE FROM rollup_sources")
+
+    def refresh(self):
+        with self.lock:
+            for day in self.archive.days():
+                self.ingest_day(day)
+
+    def ingest_day(self, day: date):
+        path = self.archive.day_file(day)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return
+        if self.source(day) == (stat.st_ino, stat.st_size):
+            return
+
+        with self.conn:
+            # another app instance may be ingesting the same file, so the offset is read under the write lock
+            self.conn.execute("BEGIN IMMEDIATE")
+            inode, offset = self.source(day) or (None, 0)
+            if inode != stat.st_ino or stat.st_size < offset:
+                offset = 0
+            with open(path, "rb") as f:
+                f.seek(offset)
+                records, consumed = parse_json_lines(f.read())
+                ids = [data["order_id"] for data in records]
+                if offset and (len(set(ids)) < len(ids) or self.seen_any(day, ids)):
+                    # a re-archived order replaces its earlier record, so the whole day is folded again
+                    offset = 0
+                    f.seek(0)
+                    records, consumed = parse_json_lines(f.read())
+            if offset == 0:
+                records = latest_records(records)
+                self.conn.execute("DELETE FROM rollups WHERE bucket LIKE ?", (day.isoformat() + "%",))
+                self.conn.execute("DELETE FROM rollup_orders WHERE day = ?", (day.isoformat(),))
+
+            self.conn.executemany("""
+                INSERT INTO rollups (granularity, bucket, dimension, key, orders, quantity, revenue_cents)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(granularity, bucket, dimension, key) DO UPDATE SET
+                    orders = orders + excluded.orders,
+                    quantity = quantity + excluded.quantity,
+                    revenue_cents = revenue_cents + excluded.revenue_cents
+            """, [row for data in records for row in order_rows(data)])
+            self.conn.executemany("INSERT INTO rollup_orders (day, order_id) VALUES (?, ?)",
+                                  [(day.isoformat(), data["order_id"]) for data in records])
+            self.conn.execute(
+                "INSERT OR REPLACE INTO rollup_sources (day, inode, offset) VALUES (?, ?, ?)",
+                (day.isoformat(), stat.st_ino, offset + consumed)
+            )
+
+    def source(self, day: date):
+        return self.conn.execute("SELECT inode, offset FROM rollup_sources WHERE day = ?",
+                                 (day.isoformat(),)).fetchone()
+
+    def seen_any(self, day: date, order_ids: List[str]) -> bool:
+        for i in range(0, len(order_ids), 500):
+            chunk = order_ids[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            if self.conn.execute(f"SELECT 1 FROM rollup_orders WHERE day = ? AND order_id IN ({placeholders}) LIMIT 1",
+                                 [day.isoformat(), *chunk]).fetchone():
+                return True
+        return False
+
+    def summary(self, start: date, end: date) -> RollupSummary:
+        self.refresh()
+        with self.lock:
+            rows = self.conn.execute("""
+                SELECT dimension, key, SUM(orders), SUM(quantity), SUM(revenue_cents) FROM rollups
+                WHERE granularity = ? AND bucket BETWEEN ? AND ?
+                GROUP BY dimension, key
+            """, (DAY, start.isoformat(), end.isoformat())).fetchall()
+
+        status_counts, items_sold, revenue_cents = {}, {}, 0
+        for dimension, key, orders, quantity, revenue in rows:
+            if dimension == STATUS:
+                status_counts[key] = orders
+                if key == Order.COMPLETED:
+                    revenue_cents = revenue
+            else:
+                items_sold[key] = quantity
+        return RollupSummary(status_counts, revenue_cents, items_sold)
+
+    def series(self, start: date, end: date, view: str = DAY) -> List[SeriesPoint]:
+        granularity, bucket_expr = SERIES_BUCKETS[view]
+        self.refresh()
+        with self.lock:
+            rows = self.conn.execute(f"""
+                SELECT {bucket_expr} AS period, SUM(orders),
+                       SUM(CASE WHEN key = ? THEN revenue_cents ELSE 0 END)
+                FROM rollups
+                WHERE granularity = ? AND dimension = ? AND bucket >= ? AND bucket < ?
+                GROUP BY period ORDER BY period
+            """, (Order.COMPLETED, granularity, STATUS, start.isoformat(),
+                  (end + timedelta(days=1)).isoformat())).fetchall()
+        return [SeriesPoint(*row) for row in rows]
+
+
+def view_range(view: str, today: date = None):
+    today = today or date.today()
+    if view == WEEK:
+        return today - timedelta(days=6), today
+    if view == MONTH:
+        return today - timedelta(days=29), today
+    return today, today
@@ -0,0 +1,91 @@
+import itertools
+from bisect import bisect_left, insort
+from datetime import timedelta
+from typing import Callable, Dict, Iterable, List
+from .order import Order
+
+DEFAULT_PROMISE_MINUTES = 20
+BASE_PREP_SECONDS = 180
+ITEM_PREP_SECONDS = 60
+
+OPEN_STATUSES = (Order.PENDING, Order.PROCESSING)
+
+
+def default_prep_estimate(order: Order) -> float:
+    return BASE_PREP_SECONDS + ITEM_PREP_SECONDS * sum(item.quantity for item in order.items)
+
+
+def promised_time(order: Order, promise_minutes: int = DEFAULT_PROMISE_MINUTES):
+    placed = order.status_time(Order.PENDING) or order.created_at
+    return placed + timedelta(minutes=promise_minutes)
+
+
+class KitchenQueue:
+    def __init__(self, estimator: Callable[[Order], float] = default_prep_estimate,
+                 station: str = None, promise_minutes: int = DEFAULT_PROMISE_MINUTES):
+        self.estimator = estimator
+        self.station = station
+        self.promise_minutes = promise_minutes
+        # kept sorted by (priority, counter) so each delta is a bisect and every page is a slice
+        self.sorted_entries: List[tuple] = []
+        self.entries: Dict[str, tuple] = {}
+        self.counter = itertools.count()
+        self._ordered = None
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self.entries
+
+    def is_open(self, order: Order) -> bool:
+        if order.status not in OPEN_STATUSES:
+            return False
+        return self.station is None or order.stations.get(self.station) in OPEN_STATUSES
+
+    def priority(self, order: Order) -> tuple:
+        # latest time the kitchen can start and still hit the promise, then age, then bigger tables first
+        due = promised_time(order, self.promise_minutes).timestamp()
+        start_by = due - self.estimator(order)
+        size = sum(item.quantity for item in order.items)
+        return (start_by, order.created_at.timestamp(), -size)
+
+    def push(self, order: Order):
+        self.remove(order.order_id)
+        entry = (self.priority(order), next(self.counter), order)
+        self.entries[order.order_id] = entry
+        insort(self.sorted_entries, entry)
+        self._ordered = None
+
+    def remove(self, order_id: str):
+        entry = self.entries.pop(order_id, None)
+        if entry is None:
+            return
+        del self.sorted_entries[bisect_left(self.sorted_entries, entry)]
+        self._ordered = None
+
+    def update(self, order: Order):
+        if self.is_open(order):
+            self.push(order)
+        else:
+            self.remove(order.order_id)
+
+    def apply(self, orders: Iterable[Order]):
+        for order in orders:
+            self.update(order)
+
+    def reset(self, orders: Iterable[Order]):
+        self.entries = {}
+        self._ordered = None
+        for order in orders:
+            if self.is_open(order):
+                self.entries[order.order_id] = (self.priority(order), next(self.counter), order)
+        self.sorted_entries = sorted(self.entries.values())
+
+    def top(self, count: int) -> List[Order]:
+        return [entry[-1] for entry in self.sorted_entries[:count]]
+
+    def ordered(self) -> List[Order]:
+        if self._ordered is None:
+            self._ordered = [entry[-1] for entry in self.sorted_entries]
+        return self._ordered
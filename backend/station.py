@@ -0,0 +1,41 @@
+from typing import Dict, List
+from .order import Order, OrderItem
+
+GRILL = "grill"
+DRINKS = "drinks"
+DESSERT = "dessert"
+
+STATIONS = [GRILL, DRINKS, DESSERT]
+DEFAULT_STATION = GRILL
+
+CATEGORY_STATIONS = {
+    "Food": GRILL,
+    "Extra": GRILL,
+    "Drinks": DRINKS,
+    "Dessert": DESSERT,
+}
+
+
+def station_for_category(category: str) -> str:
+    return CATEGORY_STATIONS.get(category, DEFAULT_STATION)
+
+
+def build_station_index(menu_items) -> Dict[str, str]:
+    return {item.id: station_for_category(item.category) for item in menu_items}
+
+
+def split_order(order: Order, station_index: Dict[str, str]) -> Dict[str, List[OrderItem]]:
+    tickets = {}
+    for item in order.items:
+        station = station_index.get(item.product_id, DEFAULT_STATION)
+        tickets.setdefault(station, []).append(item)
+    return tickets
+
+
+def route_order(order: Order, station_index: Dict[str, str]) -> Dict[str, List[OrderItem]]:
+    tickets = split_order(order, station_index)
+    for station, items in tickets.items():
+        for item in items:
+            item.station = station
+    order.stations = {station: Order.PENDING for station in tickets}
+    return tickets
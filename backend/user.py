@@ -1,6 +1,8 @@
 import json
 
 class User: 
+    __slots__ = ("__username", "__password", "__role")
+
     def __init__(self, username, password, role):
         self.__username = username
         self.__password = password
@@ -26,14 +28,20 @@ class User:
         }
 
 class Admin(User):
+    __slots__ = ()
+
     def __init__(self, username, password):
         super().__init__(username, password, "admin")
 
 class Waiter(User):
+    __slots__ = ()
+
     def __init__(self, username, password):
         super().__init__(username, password, "waiter")
 
 class Chef(User):
+    __slots__ = ()
+
     def __init__(self, username, password):
         super().__init__(username, password, "chef")
 
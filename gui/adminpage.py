@@ -2,12 +2,20 @@ import sys
 import os
 import tkinter as tk
 from tkinter import messagebox, simpledialog, ttk
-from collections import Counter
+from bisect import bisect_left
+from collections import Counter, namedtuple
 from datetime import datetime
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from backend.order import load_orders, Order as OrderClass
+from backend.order import load_orders, load_orders_since, watch_orders, today_range, Order as OrderClass
 from backend.user import load_users, save_users, Admin, Waiter, Chef, User
 from backend.menuitem import load_menu_items, save_menu_items, MenuItem
+from backend.aggregates import OrderAggregates
+from backend.rollups import RollupStore, view_range, HOUR, DAY, WEEK, MONTH
+from backend.scheduler import KitchenQueue
+from backend.metrics import KitchenMetrics, WAIT, PREP, PERCENTILES, format_duration
+from backend.analytics import ANALYTICS_AVAILABLE, load_analytics, format_report
+from backend import reporting
+from gui.backgroundloader import BackgroundLoader
 
 BG_COLOR = "#2B0505"       
 SIDEBAR_COLOR = "#450A0A"  
@@ -18,6 +26,20 @@ ACCENT_GREEN = "#28a745"
 ACCENT_BLUE = "#0D6EFD"
 ACCENT_RED = "#DC3545"
 
+HISTORY_COLUMNS = [
+    ("created", "DATE & TIME", 140),
+    ("customer", "CUSTOMER", 140),
+    ("items", "ITEMS", 320),
+    ("total", "TOTAL", 100),
+    ("status", "STATUS", 120),
+]
+
+SLA_ITEM_ROWS = 8
+ANALYTICS_VIEWS = [(DAY, "DAY"), (WEEK, "WEEK"), (MONTH, "MONTH")]
+
+AnalyticsView = namedtuple("AnalyticsView", ["view", "summary", "series"])
+AdminSnapshot = namedtuple("AdminSnapshot", ["changes", "history", "totals", "sla"])
+
 class AdminDashboard(tk.Toplevel):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -34,15 +56,27 @@ class AdminDashboard(tk.Toplevel):
         self.main_area.pack(side="right", fill="both", expand=True)
 
         self.stat_labels = {}
-        self.table_scrollable_frame = None 
-        self.last_table_hash = None        
-        self.table_window_id = None
+        self.table_rows = {}
+        self.table_sorted = []
+        self.table_sort_index = 0
+        self.table_sort_reverse = True
+        self.orders_version = -1
+        self.refresh_pending = False
+        self.metrics = KitchenMetrics()
+        self.aggregates = OrderAggregates()
+        self.totals = self.aggregates.snapshot()
+        self.rollups = RollupStore()
+        self.kitchen_queue = KitchenQueue()
+        self.sla = None
 
         self.build_stats_row()
         self.build_queue_section()
         self.build_table_structure()       
 
-        self.refresh_timer()
+        self.loader = BackgroundLoader(self, self.apply_snapshot)
+        self.on_orders_changed()
+        watch_orders(self.on_orders_changed)
+        self.kitchen_canvas.bind("<Configure>", lambda e: self.update_queue_display())
 
     def build_sidebar_icons(self):
         icons = ["📋", "📊", "👥"]
@@ -71,6 +105,8 @@ class AdminDashboard(tk.Toplevel):
         self.stat_labels['revenue'] = self.create_card(stats_frame, "REVENUE", "$0.00", "💲")
         self.stat_labels['pending'] = self.create_card(stats_frame, "PENDING", "0 ORDERS", "🕒")
         self.stat_labels['completed'] = self.create_card(stats_frame, "COMPLETED", "0 ORDERS", "✅")
+        self.stat_labels[WAIT] = self.create_card(stats_frame, "TICKET WAIT p50/95/99", "--", "⏳")
+        self.stat_labels[PREP] = self.create_card(stats_frame, "PREP TIME p50/95/99", "--", "🔥")
 
     def create_card(self, parent, title, value, icon):
         card = tk.Frame(parent, bg=CARD_COLOR, padx=20, pady=20)
@@ -82,19 +118,23 @@ class AdminDashboard(tk.Toplevel):
         value_label.pack(anchor="w")
         return value_label
 
-    def update_stats(self, orders):
+    def update_stats(self, totals):
         try:
-            completed_orders = [o for o in orders if o.status == OrderClass.COMPLETED]
-            pending_orders = [o for o in orders if o.status in [OrderClass.PENDING, OrderClass.PROCESSING]]
-
-            total_revenue = sum(o.get_total() for o in completed_orders)
+            counts = totals.status_counts
+            pending_count = counts.get(OrderClass.PENDING, 0) + counts.get(OrderClass.PROCESSING, 0)
+            completed_count = counts.get(OrderClass.COMPLETED, 0)
 
-            self.stat_labels['revenue'].config(text=f"${total_revenue:,.2f}")
-            self.stat_labels['pending'].config(text=f"{len(pending_orders)} ORDERS")
-            self.stat_labels['completed'].config(text=f"{len(completed_orders)} ORDERS")
+            self.stat_labels['revenue'].config(text=f"${totals.revenue_cents / 100:,.2f}")
+            self.stat_labels['pending'].config(text=f"{pending_count} ORDERS")
+            self.stat_labels['completed'].config(text=f"{completed_count} ORDERS")
         except Exception:
             pass
 
+    def update_sla(self, sla):
+        for metric in (WAIT, PREP):
+            figures = sla[metric]
+            self.stat_labels[metric].config(text=" / ".join(format_duration(figures[p]) for p in PERCENTILES))
+
     def build_queue_section(self):
         queue_label = tk.Label(self.main_area, text="LIVE KITCHEN QUEUE",
                               font=("Segoe UI", 12, "bold"), bg=BG_COLOR, fg=TEXT_WHITE)
@@ -112,8 +152,12 @@ class AdminDashboard(tk.Toplevel):
         self.kitchen_canvas = tk.Canvas(kitchen_frame, bg="#3D0808", height=120, highlightthickness=0)
         self.kitchen_canvas.pack(fill="both", expand=True)
 
-    def update_queue_display(self, orders):
-        kitchen_orders = [o for o in orders if o.status in [OrderClass.PENDING, OrderClass.PROCESSING]]
+    def update_queue_display(self):
+        x_offset = 10
+        y_offset = 10
+        card_w = 200
+        card_h = 100
+        kitchen_orders = self.kitchen_queue.top(max(1, self.kitchen_canvas.winfo_width() // (card_w + 10)))
         
         self.kitchen_canvas.delete("all")
 
@@ -121,11 +165,6 @@ class AdminDashboard(tk.Toplevel):
             self.kitchen_canvas.create_text(self.kitchen_canvas.winfo_width()/2, 60, text="No Active Orders",
                                font=("Segoe UI", 11), fill="#FFAAAA", anchor="center")
             return
-
-        x_offset = 10
-        y_offset = 10
-        card_w = 200
-        card_h = 100
         
         for i, order in enumerate(kitchen_orders):
             if x_offset + card_w > self.kitchen_canvas.winfo_width(): break 
@@ -148,123 +187,230 @@ class AdminDashboard(tk.Toplevel):
             x_offset += card_w + 10
 
     def build_table_structure(self):
-        headers = ["DATE & TIME", "CUSTOMER", "ITEMS", "TOTAL", "STATUS"]
-
         table_frame = tk.Frame(self.main_area, bg=CARD_COLOR, padx=20, pady=20)
         table_frame.pack(fill="both", expand=True)
 
-        header_row = tk.Frame(table_frame, bg=CARD_COLOR)
-        header_row.pack(fill="x", pady=(0, 10))
-        
-        for i, col in enumerate(headers):
-            weight = 2 if i == 2 else 1
-            header_row.columnconfigure(i, weight=weight)
-            
-            tk.Label(header_row, text=col, font=("Segoe UI", 10, "bold"),
-                     bg=CARD_COLOR, fg="#FFAAAA", anchor="w").grid(row=0, column=i, sticky="ew")
-
-        tk.Frame(table_frame, bg="#883333", height=2).pack(fill="x", pady=(0, 10))
+        style = ttk.Style(self)
+        style.configure("History.Treeview", background=CARD_COLOR, fieldbackground=CARD_COLOR,
+                        foreground="white", font=("Segoe UI", 10), rowheight=28, borderwidth=0)
+        style.configure("History.Treeview.Heading", background=CARD_COLOR, foreground="#FFAAAA",
+                        font=("Segoe UI", 10, "bold"), relief="flat")
+        style.map("History.Treeview", background=[("selected", "#883333")])
+
+        self.history_table = ttk.Treeview(table_frame, columns=[c[0] for c in HISTORY_COLUMNS],
+                                          show="headings", style="History.Treeview")
+        for column, title, width in HISTORY_COLUMNS:
+            self.history_table.heading(column, text=title, anchor="w",
+                                       command=lambda c=column: self.sort_table(c))
+            self.history_table.column(column, width=width, anchor="w")
+
+        self.history_table.tag_configure(OrderClass.COMPLETED, foreground=ACCENT_GREEN)
+        self.history_table.tag_configure(OrderClass.PENDING, foreground="#FFC107")
+        self.history_table.tag_configure(OrderClass.PROCESSING, foreground=ACCENT_BLUE)
+
+        scrollbar = tk.Scrollbar(table_frame, orient="vertical", command=self.history_table.yview)
+        self.history_table.configure(yscrollcommand=scrollbar.set)
+        self.history_table.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
 
-        orders_area = tk.Frame(table_frame, bg=CARD_COLOR)
-        orders_area.pack(fill="both", expand=True)
+        self.table_empty_label = tk.Label(table_frame, text="No order history found.", bg=CARD_COLOR, fg="white")
+        self.table_empty_label.place(relx=0.5, rely=0.5, anchor="center")
 
-        canvas = tk.Canvas(orders_area, bg=CARD_COLOR, highlightthickness=0)
-        scrollbar = tk.Scrollbar(orders_area, orient="vertical", command=canvas.yview)
-        
-        self.table_scrollable_frame = tk.Frame(canvas, bg=CARD_COLOR)
-        
-        self.table_window_id = canvas.create_window((0, 0), window=self.table_scrollable_frame, anchor="nw")
+    def history_row(self, o):
+        created_str = o.created_at.strftime("%b %d, %H:%M")
+        items_text = ", ".join([f"{it.name}" for it in o.items])
+        if len(items_text) > 40: items_text = items_text[:37] + "..."
+        total = o.get_total()
+        values = (created_str, o.customer_id, items_text, f"${total:.2f}", o.status)
+        sort_values = (o.created_at, o.customer_id, items_text, total, o.status)
+        return values, sort_values
 
-        def on_canvas_configure(event):
-            canvas.configure(scrollregion=canvas.bbox("all"))
-            canvas.itemconfig(self.table_window_id, width=event.width)
+    def table_sort_key(self, order_id):
+        return (self.table_rows[order_id][1][self.table_sort_index], order_id)
 
-        canvas.bind("<Configure>", on_canvas_configure)
-        canvas.configure(yscrollcommand=scrollbar.set)
+    def table_position(self, index):
+        return len(self.table_sorted) - 1 - index if self.table_sort_reverse else index
 
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        self.update_table_content(load_orders())
+    def reset_table(self, orders):
+        self.history_table.delete(*self.history_table.get_children())
+        self.table_rows = {}
+        self.table_sorted = []
+        for o in orders:
+            self.table_rows[o.order_id] = self.history_row(o)
+        self.table_sorted = sorted(self.table_sort_key(order_id) for order_id in self.table_rows)
+        for _, order_id in (reversed(self.table_sorted) if self.table_sort_reverse else self.table_sorted):
+            values, sort_values = self.table_rows[order_id]
+            self.history_table.insert("", "end", iid=order_id, values=values, tags=(sort_values[4],))
+        self.update_empty_label()
 
     def update_table_content(self, orders):
-        orders.sort(key=lambda x: x.created_at, reverse=True)
-
-        current_hash = "".join([f"{o.order_id}{o.status}" for o in orders])
-        if self.last_table_hash == current_hash:
-            return 
-        self.last_table_hash = current_hash
-
-        for widget in self.table_scrollable_frame.winfo_children():
-            widget.destroy()
-
-        if not orders:
-             tk.Label(self.table_scrollable_frame, text="No order history found.", bg=CARD_COLOR, fg="white").pack(pady=20)
-             return
-
         for o in orders:
-            created_str = o.created_at.strftime("%b %d, %H:%M")
-            items_text = ", ".join([f"{it.name}" for it in o.items])
-            if len(items_text) > 40: items_text = items_text[:37] + "..."
-            total = o.get_total()
-            
-            row_frame = tk.Frame(self.table_scrollable_frame, bg=CARD_COLOR)
-            row_frame.pack(fill="x", pady=5)
-            
-            data = [created_str, o.customer_id, items_text, f"${total:.2f}", o.status]
-            
-            status_color = "white"
-            if o.status == OrderClass.COMPLETED: status_color = ACCENT_GREEN
-            elif o.status == OrderClass.PENDING: status_color = "#FFC107"
-            elif o.status == OrderClass.PROCESSING: status_color = ACCENT_BLUE
-
-            for i, item in enumerate(data):
-                weight = 2 if i == 2 else 1
-                row_frame.columnconfigure(i, weight=weight)
-                
-                fg_color = status_color if i == 4 else "white"
-                
-                tk.Label(row_frame, text=item, font=("Segoe UI", 10),
-                         bg=CARD_COLOR, fg=fg_color, anchor="w").grid(row=0, column=i, sticky="ew")
-            
-            tk.Frame(self.table_scrollable_frame, bg="#441111", height=1).pack(fill="x", pady=2)
+            row = self.history_row(o)
+            previous = self.table_rows.get(o.order_id)
+            if previous == row:
+                continue
+            if previous is not None:
+                old_key = self.table_sort_key(o.order_id)
+                self.table_rows[o.order_id] = row
+                self.history_table.item(o.order_id, values=row[0], tags=(row[1][4],))
+                if old_key == self.table_sort_key(o.order_id):
+                    continue
+                del self.table_sorted[bisect_left(self.table_sorted, old_key)]
+            else:
+                self.table_rows[o.order_id] = row
+
+            key = self.table_sort_key(o.order_id)
+            index = bisect_left(self.table_sorted, key)
+            self.table_sorted.insert(index, key)
+            if previous is None:
+                self.history_table.insert("", self.table_position(index), iid=o.order_id,
+                                          values=row[0], tags=(row[1][4],))
+            else:
+                self.history_table.move(o.order_id, "", self.table_position(index))
+        self.update_empty_label()
+
+    def sort_table(self, column):
+        index = [c[0] for c in HISTORY_COLUMNS].index(column)
+        if index == self.table_sort_index:
+            self.table_sort_reverse = not self.table_sort_reverse
+        else:
+            self.table_sort_index = index
+            self.table_sort_reverse = False
+        self.table_sorted = sorted(self.table_sort_key(order_id) for order_id in self.table_rows)
+        keys = reversed(self.table_sorted) if self.table_sort_reverse else self.table_sorted
+        for position, (_, order_id) in enumerate(keys):
+            self.history_table.move(order_id, "", position)
+
+    def update_empty_label(self):
+        if self.table_rows:
+            self.table_empty_label.place_forget()
+        else:
+            self.table_empty_label.place(relx=0.5, rely=0.5, anchor="center")
+
+    def on_orders_changed(self):
+        if self.refresh_pending:
+            return
+        self.refresh_pending = True
+        self.loader.submit(self.load_snapshot)
+
+    def load_snapshot(self):
+        self.refresh_pending = False
+        changes = load_orders_since(self.orders_version)
+        if not changes.orders and not changes.reset:
+            return None
+
+        history = [o.materialize() for o in load_orders(today_range())] if changes.reset else None
+        for o in changes.orders:
+            o.materialize()
+        if history is not None:
+            self.metrics.reset()
+            self.metrics.observe_orders(history)
+            self.aggregates.rebuild(history)
+        self.metrics.observe_orders(changes.orders)
+        self.aggregates.apply_all(changes.orders)
+        sla = {
+            WAIT: self.metrics.summary(WAIT),
+            PREP: self.metrics.summary(PREP),
+            "hourly": {metric: self.metrics.by_hour(metric) for metric in (WAIT, PREP)},
+            "by_item": {metric: self.metrics.by_item(metric) for metric in (WAIT, PREP)},
+        }
+        self.orders_version = changes.version
+        return AdminSnapshot(changes, history, self.aggregates.snapshot(), sla)
 
-    def refresh_timer(self):
+    def apply_snapshot(self, snapshot):
         try:
-            orders = load_orders()
-            self.update_stats(orders)
-            self.update_queue_display(orders)
-            self.update_table_content(orders)
+            if snapshot.history is not None:
+                self.kitchen_queue.reset(snapshot.history)
+                self.reset_table(snapshot.history)
+            for o in snapshot.changes.orders:
+                self.kitchen_queue.update(o)
+
+            self.totals = snapshot.totals
+            self.update_stats(snapshot.totals)
+            self.sla = snapshot.sla
+            self.update_sla(snapshot.sla)
+            self.update_queue_display()
+            self.update_table_content(snapshot.changes.orders)
         except Exception as e:
             print(f"Refresh error: {e}")
-        
-        self.after(2000, self.refresh_timer)
 
     def open_reports_analytics(self, event=None):
         win = tk.Toplevel(self)
         win.title("SmartChef - Detailed Analytics")
-        win.geometry("1000x700")
+        win.geometry("1100x750")
         win.configure(bg=BG_COLOR)
-
-        orders = load_orders()
-        completed = [o for o in orders if o.status == OrderClass.COMPLETED]
         
-        total_rev = sum(o.get_total() for o in completed)
-        total_orders = len(orders)
-        avg_order = total_rev / len(completed) if completed else 0
+        tk.Label(win, text="Analytics Dashboard", font=("Segoe UI", 24, "bold"), 
+                 bg=BG_COLOR, fg=TEXT_WHITE).pack(pady=(20, 5))
+
+        view_bar = tk.Frame(win, bg=BG_COLOR)
+        view_bar.pack(pady=(0, 5))
+        content = tk.Frame(win, bg=BG_COLOR)
+        loader = BackgroundLoader(win, lambda result: self.show_analytics(content, result))
+
+        for view, label in ANALYTICS_VIEWS:
+            tk.Button(view_bar, text=label, font=("Segoe UI", 10, "bold"), bg=CARD_COLOR, fg="white", relief="flat",
+                      width=10, command=lambda v=view: loader.submit(lambda: self.load_analytics_view(v))).pack(side="left", padx=5)
+        reports = BackgroundLoader(win, lambda result: self.show_report(*result))
+        tk.Button(view_bar, text="MONTH-END", font=("Segoe UI", 10, "bold"), bg=ACCENT_BLUE, fg="white", relief="flat",
+                  width=10, command=lambda: reports.submit(self.load_month_report)).pack(side="left", padx=5)
+        if ANALYTICS_AVAILABLE:
+            tk.Button(view_bar, text="INSIGHTS", font=("Segoe UI", 10, "bold"), bg=ACCENT_BLUE, fg="white", relief="flat",
+                      width=10, command=lambda: reports.submit(self.load_insights)).pack(side="left", padx=5)
+
+        if self.sla and self.sla["hourly"][WAIT]:
+            sla_frame = tk.Frame(win, bg=BG_COLOR)
+            sla_frame.pack(fill="x", padx=10, pady=(0, 20))
+            hourly, by_item = self.sla["hourly"], self.sla["by_item"]
+            self.draw_sla_table(sla_frame, "Kitchen SLA by Hour (p95)", "Hour", hourly, list(hourly[WAIT]),
+                                lambda hour: f"{hour:02d}:00")
+            slowest = sorted(by_item[WAIT], key=lambda name: by_item[PREP].get(name, {}).get(95) or 0, reverse=True)
+            self.draw_sla_table(sla_frame, "Kitchen SLA by Item (p95)", "Item", by_item, slowest[:SLA_ITEM_ROWS], str)
+        content.pack(fill="both", expand=True)
+        loader.submit(lambda: self.load_analytics_view(DAY))
+
+    def load_month_report(self):
+        start, end = reporting.month_range()
+        return "Month-End Report", reporting.format_report(reporting.run_report(start, end), start, end)
+
+    def load_insights(self):
+        return "Insights (Last 30 Days)", format_report(load_analytics(view_range(MONTH)))
+
+    def show_report(self, title, report):
+        win = tk.Toplevel(self)
+        win.title(f"SmartChef - {title}")
+        win.geometry("600x650")
+        win.configure(bg=BG_COLOR)
+
+        text = tk.Text(win, bg=CARD_COLOR, fg=TEXT_WHITE, font=("Consolas", 10), relief="flat", padx=15, pady=15)
+        text.pack(fill="both", expand=True, padx=20, pady=20)
+        text.insert("1.0", report)
+        text.config(state="disabled")
+
+    def load_analytics_view(self, view):
+        start, end = view_range(view)
+        summary = self.rollups.summary(start, end)
+        series = self.rollups.series(start, end, HOUR if view == DAY else DAY)
+        return AnalyticsView(view, summary, series)
+
+    def show_analytics(self, content, result):
+        for widget in content.winfo_children():
+            widget.destroy()
+
+        summary = result.summary
+        status_counts = dict(summary.status_counts)
+        for status in (OrderClass.PENDING, OrderClass.PROCESSING):
+            status_counts[status] = self.totals.status_counts.get(status, 0)
+        completed_count = status_counts.get(OrderClass.COMPLETED, 0)
         
-        all_items = []
-        for o in orders:
-            for i in o.items:
-                all_items.append(i.name)
+        total_rev = summary.revenue_cents / 100
+        total_orders = sum(status_counts.values())
+        avg_order = total_rev / completed_count if completed_count else 0
         
-        counts = Counter(all_items)
+        counts = Counter(summary.items_sold)
         pop_item = counts.most_common(1)[0][0] if counts else "N/A"
-        
-        tk.Label(win, text="Analytics Dashboard", font=("Segoe UI", 24, "bold"), 
-                 bg=BG_COLOR, fg=TEXT_WHITE).pack(pady=20)
 
-        metrics_frame = tk.Frame(win, bg=BG_COLOR)
+        metrics_frame = tk.Frame(content, bg=BG_COLOR)
         metrics_frame.pack(fill="x", padx=20, pady=10)
 
         self.create_analytic_card(metrics_frame, "Total Revenue", f"${total_rev:,.2f}", ACCENT_GOLD)
@@ -272,13 +418,56 @@ class AdminDashboard(tk.Toplevel):
         self.create_analytic_card(metrics_frame, "Avg Order Value", f"${avg_order:.2f}", ACCENT_GREEN)
         self.create_analytic_card(metrics_frame, "Popular Item", pop_item, ACCENT_RED)
 
-        chart_frame = tk.Frame(win, bg=CARD_COLOR, padx=20, pady=20)
+        chart_frame = tk.Frame(content, bg=CARD_COLOR, padx=20, pady=20)
         chart_frame.pack(fill="both", expand=True, padx=20, pady=20)
 
-        tk.Label(chart_frame, text="Order Status Distribution", font=("Segoe UI", 14, "bold"), 
+        status_frame = tk.Frame(chart_frame, bg=CARD_COLOR)
+        status_frame.pack(side="left", fill="both", expand=True)
+        tk.Label(status_frame, text="Order Status Distribution", font=("Segoe UI", 14, "bold"), 
                  bg=CARD_COLOR, fg="white").pack(anchor="w", pady=(0, 10))
+        self.draw_status_chart(status_frame, status_counts)
 
-        self.draw_status_chart(chart_frame, orders)
+        series_frame = tk.Frame(chart_frame, bg=CARD_COLOR)
+        series_frame.pack(side="right", fill="both", expand=True)
+        series_title = "Revenue by Hour" if result.view == DAY else "Revenue by Day"
+        tk.Label(series_frame, text=series_title, font=("Segoe UI", 14, "bold"),
+                 bg=CARD_COLOR, fg="white").pack(anchor="w", pady=(0, 10))
+        self.draw_revenue_series(series_frame, result.series)
+
+    def draw_revenue_series(self, parent, series):
+        canvas = tk.Canvas(parent, bg=BG_COLOR, height=250, width=420, highlightthickness=0)
+        canvas.pack(fill="both", expand=True)
+        if not series:
+            canvas.create_text(210, 110, text="No completed orders in this range", fill="#CCC", font=("Segoe UI", 10))
+            return
+
+        h = 200
+        max_val = max(point.revenue_cents for point in series) or 1
+        bar_width = max(4, min(40, 380 // len(series) - 4))
+        for i, point in enumerate(series):
+            x = 20 + i * (bar_width + 4)
+            bar_h = (point.revenue_cents / max_val) * (h - 40)
+            canvas.create_rectangle(x, h - bar_h, x + bar_width, h, fill=ACCENT_GOLD, outline="")
+        canvas.create_text(20, h + 15, text=series[0].bucket[-5:], fill="#CCC", font=("Segoe UI", 9), anchor="w")
+        canvas.create_text(20 + len(series) * (bar_width + 4), h + 15, text=series[-1].bucket[-5:],
+                           fill="#CCC", font=("Segoe UI", 9), anchor="e")
+        canvas.create_text(20, 10, text=f"max ${max_val / 100:,.2f}", fill="#CCC", font=("Segoe UI", 9), anchor="nw")
+
+    def draw_sla_table(self, parent, title, heading, breakdown, keys, label):
+        frame = tk.Frame(parent, bg=CARD_COLOR, padx=20, pady=10)
+        frame.pack(side="left", fill="both", expand=True, padx=10)
+
+        tk.Label(frame, text=title, font=("Segoe UI", 14, "bold"),
+                 bg=CARD_COLOR, fg="white").grid(row=0, column=0, columnspan=3, sticky="w", pady=(0, 5))
+        for col, column_title in enumerate([heading, "Ticket Wait", "Prep Time"]):
+            tk.Label(frame, text=column_title, font=("Segoe UI", 10, "bold"), bg=CARD_COLOR, fg="#FFAAAA",
+                     width=12, anchor="w").grid(row=1, column=col, sticky="w")
+        for row, key in enumerate(keys, start=2):
+            prep = breakdown[PREP].get(key, {}).get(95)
+            values = [label(key), format_duration(breakdown[WAIT][key][95]), format_duration(prep)]
+            for col, value in enumerate(values):
+                tk.Label(frame, text=value, font=("Segoe UI", 10), bg=CARD_COLOR, fg=TEXT_WHITE,
+                         width=12, anchor="w").grid(row=row, column=col, sticky="w")
 
     def create_analytic_card(self, parent, title, value, color):
         card = tk.Frame(parent, bg=CARD_COLOR, padx=15, pady=15)
@@ -287,12 +476,11 @@ class AdminDashboard(tk.Toplevel):
         tk.Label(card, text=title, font=("Segoe UI", 10), bg=CARD_COLOR, fg="#CCC").pack(anchor="w")
         tk.Label(card, text=value, font=("Segoe UI", 18, "bold"), bg=CARD_COLOR, fg=color).pack(anchor="w")
 
-    def draw_status_chart(self, parent, orders):
+    def draw_status_chart(self, parent, status_counts):
         canvas = tk.Canvas(parent, bg=BG_COLOR, height=250, highlightthickness=0)
         canvas.pack(fill="both", expand=True)
         
-        statuses = [o.status for o in orders]
-        c = Counter(statuses)
+        c = status_counts
         data = {
             "Completed": c.get(OrderClass.COMPLETED, 0),
             "Pending": c.get(OrderClass.PENDING, 0) + c.get(OrderClass.PROCESSING, 0),
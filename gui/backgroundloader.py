@@ -0,0 +1,80 @@
+import queue
+import threading
+import tkinter as tk
+
+STOP = object()
+
+
+class BackgroundLoader:
+    def __init__(self, widget, on_result):
+        self.widget = widget
+        self.root = widget._root()
+        self.on_result = on_result
+        self.jobs = queue.Queue()
+        self.results = queue.Queue()
+        self.mainloop_running = False
+        self.stopped = False
+        self.paused = False
+        self.thread = threading.Thread(target=self.run, name="BackgroundLoader", daemon=True)
+        self.thread.start()
+        self.widget.bind("<Destroy>", self.on_destroy, add="+")
+        # fires once mainloop is up and drains anything finished during startup; after that the worker wakes Tk itself
+        self.root.after_idle(self.start)
+
+    def submit(self, job):
+        if not self.stopped:
+            self.jobs.put(job)
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+        self.drain()
+
+    def stop(self):
+        if not self.stopped:
+            self.stopped = True
+            self.jobs.put(STOP)
+
+    def on_destroy(self, event):
+        if event.widget is self.widget:
+            self.stop()
+
+    def run(self):
+        while True:
+            job = self.jobs.get()
+            if job is STOP:
+                return
+            try:
+                result = job()
+            except Exception as e:
+                print(f"Background load error: {e}")
+                continue
+            if result is None:
+                continue
+
+            self.results.put(result)
+            if self.mainloop_running and not self.paused:
+                try:
+                    self.root.after(0, self.drain)
+                except (RuntimeError, tk.TclError):
+                    self.stop()
+                    return
+
+    def start(self):
+        self.mainloop_running = True
+        self.drain()
+
+    def drain(self):
+        if self.stopped or self.paused:
+            return
+        while True:
+            try:
+                result = self.results.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                self.on_result(result)
+            except Exception as e:
+                print(f"Background result error: {e}")
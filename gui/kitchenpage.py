@@ -3,9 +3,13 @@ import time
 import sys
 import os
 import json
+from collections import namedtuple
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from backend.order import load_orders, Order as OrderClass, save_order
+from backend.order import load_orders_since, get_active_orders, watch_orders, transition_order, Order as OrderClass, TRANSITION_APPLIED
 from backend.receipt import Receipt
+from backend.scheduler import KitchenQueue
+from backend.prepmodel import PrepModel, build_prep_model
+from gui.backgroundloader import BackgroundLoader
 
 BG_COLOR = "#2B0505"
 CARD_COLOR = "#450A0A"
@@ -15,10 +19,199 @@ STATUS_PENDING = "#FFC107"
 STATUS_PREP = "#0D6EFD"     
 STATUS_READY = "#198754"    
 
+TICKET_COLUMNS = 4
+TICKET_ROW_HEIGHT = 240
+TICKET_POOL_SIZE = 32
+TICKET_HEIGHT = 220
+FRAME_INTERVAL_MS = 100
+LOW_POWER = os.environ.get("SMARTCHEF_KITCHEN_LOW_POWER", "").lower() in ("1", "true", "yes")
+
+TicketView = namedtuple("TicketView", [
+    "status", "border_color", "next_status", "next_text", "button_color",
+    "id_text", "items_text", "time_text", "ready_text"
+])
+
+def ticket_view(order: OrderClass, station: str = None, ready_at=None, is_new: bool = False) -> TicketView:
+    status = order.stations.get(station, order.status) if station else order.status
+    items = order.items_for_station(station) if station else order.items
+
+    border_color = "white"
+    if status == OrderClass.PENDING: border_color = STATUS_PENDING
+    elif status == OrderClass.PROCESSING: border_color = STATUS_PREP
+    elif status == OrderClass.COMPLETED: border_color = STATUS_READY
+    
+    if is_new:
+        border_color = "#FF00FF"
+
+    if status == OrderClass.PENDING:
+        next_status = OrderClass.PROCESSING
+        next_text = "START PREP"
+        button_color = STATUS_PREP 
+    else:
+        next_status = OrderClass.COMPLETED
+        next_text = "COMPLETE"
+        button_color = STATUS_READY 
+
+    item_list = [f"{item.quantity}x {item.name}" for item in items]
+    items_text = "\n".join(item_list[:4]) + ("..." if len(item_list) > 4 else "")
+
+    return TicketView(
+        status, border_color, next_status, next_text, button_color,
+        f"Order #{order.order_id[-4:]}", items_text, order.created_at.strftime('%H:%M'),
+        f"READY ~{ready_at.strftime('%H:%M')}" if ready_at else ""
+    )
+
+
+class TicketCard:
+    def __init__(self, parent):
+        self.container = tk.Frame(parent, padx=2, pady=2)
+        self.card = tk.Frame(self.container, bg=CARD_COLOR, width=280, height=220)
+        self.card.pack(fill="both", expand=True)
+        self.card.pack_propagate(False)
+
+        self.id_label = tk.Label(self.card, font=("Segoe UI", 9), bg=CARD_COLOR, fg="#CCC")
+        self.id_label.place(x=15, y=10)
+
+        self.action_btn = tk.Button(self.card, font=("Segoe UI", 10, "bold"), fg="white", relief="flat",
+                                    command=self.on_click)
+        self.action_btn.place(x=180, y=10, width=90, height=25)
+
+        self.customer_label = tk.Label(self.card, font=("Segoe UI", 24, "bold"), bg=CARD_COLOR, fg="white")
+        self.customer_label.place(x=15, y=30)
+
+        self.items_label = tk.Label(self.card, font=("Segoe UI", 10), bg=CARD_COLOR, fg="#EEE", justify="left")
+        self.items_label.place(x=15, y=80)
+
+        self.time_label = tk.Label(self.card, font=("Segoe UI", 18, "bold"), bg=CARD_COLOR, fg="white")
+        self.time_label.place(x=200, y=85)
+
+        self.ready_label = tk.Label(self.card, font=("Segoe UI", 9), bg=CARD_COLOR, fg="#FFD700")
+        self.ready_label.place(x=190, y=125)
+
+        self.status_label = tk.Label(self.card, font=("Segoe UI", 10, "bold"), width=15, pady=5)
+        self.status_label.place(x=80, y=170)
+
+        self.order = None
+        self.shown = None
+        self.on_action = None
+        self.rendered = {}
+        self.position = None
+
+    def on_click(self):
+        action = self.rendered.get("action")
+        if action is not None and self.on_action is not None:
+            self.on_action(*action)
+
+    def set(self, widget, key, **options):
+        if self.rendered.get(key) != options:
+            widget.configure(**options)
+            self.rendered[key] = options
+
+    def render(self, order: OrderClass, on_action, is_new: bool = False, station: str = None, ready_at=None):
+        if order is self.order and (ready_at, is_new) == self.shown:
+            return
+        self.order = order
+        self.shown = (ready_at, is_new)
+        view = ticket_view(order, station, ready_at, is_new)
+
+        self.set(self.container, "container", bg=view.border_color)
+        self.set(self.id_label, "id", text=view.id_text)
+        self.on_action = on_action
+        self.rendered["action"] = (order.order_id, view.status, view.next_status)
+        self.set(self.action_btn, "button", text=view.next_text, bg=view.button_color)
+        self.set(self.customer_label, "customer", text=order.customer_id)
+        self.set(self.items_label, "items", text=view.items_text)
+        self.set(self.time_label, "time", text=view.time_text)
+        self.set(self.ready_label, "ready", text=view.ready_text)
+        self.set(self.status_label, "status", text=view.status, bg=view.border_color,
+                 fg="black" if view.status=="Pending" else "white")
+
+    def place_at(self, row: int, col: int):
+        if self.position != (row, col):
+            self.container.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
+            self.position = (row, col)
+
+    def hide(self):
+        self.container.grid_remove()
+        self.order = None
+        self.shown = None
+        self.position = None
+
+    def destroy(self):
+        self.container.destroy()
+
+
+class TicketCanvas:
+    def __init__(self, parent):
+        self.canvas = tk.Canvas(parent, bg=BG_COLOR, highlightthickness=0)
+        self.canvas.pack(fill="both", expand=True)
+        self.drawn = {}
+        self.actions = {}
+        self.on_action = None
+        self.canvas.tag_bind("action", "<Button-1>", self.on_click)
+
+    def on_click(self, event):
+        for tag in self.canvas.gettags("current"):
+            action = self.actions.get(tag)
+            if action is not None and self.on_action is not None:
+                self.on_action(*action)
+                return
+
+    def draw(self, orders, on_action, station=None, ready_times=None):
+        ready_times = ready_times or {}
+        self.on_action = on_action
+        slot_w = max(220, self.canvas.winfo_width() // TICKET_COLUMNS)
+        visible = set()
+        for i, order in enumerate(orders):
+            row, col = divmod(i, TICKET_COLUMNS)
+            ready_at = ready_times.get(order.order_id)
+            signature = (order, row, col, slot_w, ready_at)
+            visible.add(order.order_id)
+            if self.drawn.get(order.order_id) == signature:
+                continue
+            self.canvas.delete(f"ticket-{order.order_id}")
+            self.draw_ticket(order, col * slot_w + 10, row * TICKET_ROW_HEIGHT + 10, slot_w - 20, station, ready_at)
+            self.drawn[order.order_id] = signature
+
+        for order_id in list(self.drawn):
+            if order_id not in visible:
+                self.canvas.delete(f"ticket-{order_id}")
+                self.actions.pop(f"ticket-{order_id}", None)
+                del self.drawn[order_id]
+
+    def draw_ticket(self, order, x, y, w, station, ready_at):
+        view = ticket_view(order, station, ready_at)
+        tag = f"ticket-{order.order_id}"
+        c = self.canvas
+
+        c.create_rectangle(x, y, x + w, y + TICKET_HEIGHT, fill=CARD_COLOR, outline=view.border_color, width=3, tags=tag)
+        c.create_text(x + 15, y + 12, text=view.id_text, font=("Segoe UI", 9), fill="#CCC", anchor="nw", tags=tag)
+        c.create_text(x + 15, y + 32, text=order.customer_id, font=("Segoe UI", 24, "bold"), fill="white",
+                      anchor="nw", tags=tag)
+        c.create_text(x + 15, y + 80, text=view.items_text, font=("Segoe UI", 10), fill="#EEE",
+                      anchor="nw", tags=tag)
+        c.create_text(x + w - 15, y + 85, text=view.time_text, font=("Segoe UI", 18, "bold"), fill="white",
+                      anchor="ne", tags=tag)
+        c.create_text(x + w - 15, y + 125, text=view.ready_text, font=("Segoe UI", 9), fill="#FFD700",
+                      anchor="ne", tags=tag)
+
+        c.create_rectangle(x + w / 2 - 70, y + 170, x + w / 2 + 70, y + 200, fill=view.border_color, outline="", tags=tag)
+        c.create_text(x + w / 2, y + 185, text=view.status, font=("Segoe UI", 10, "bold"),
+                      fill="black" if view.status == "Pending" else "white", tags=tag)
+
+        c.create_rectangle(x + w - 105, y + 10, x + w - 10, y + 35, fill=view.button_color, outline="",
+                           tags=(tag, "action"))
+        c.create_text(x + w - 57, y + 22, text=view.next_text, font=("Segoe UI", 10, "bold"), fill="white",
+                      tags=(tag, "action"))
+        self.actions[tag] = (order.order_id, view.status, view.next_status)
+
+
 class KitchenDashboard(tk.Toplevel):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, station=None, low_power=LOW_POWER):
         super().__init__(parent)
-        self.title("SmartChef - Kitchen Display")
+        self.station = station
+        self.low_power = low_power
+        self.title(f"SmartChef - {station.title()} Station" if station else "SmartChef - Kitchen Display")
         self.geometry("1200x800")
         self.configure(bg=BG_COLOR)
         
@@ -28,20 +221,43 @@ class KitchenDashboard(tk.Toplevel):
         self.load_background()
         
         self.order_widgets = {}   
-        self.last_statuses = {}   
+        self.ticket_pool = []
+        self.active_orders = ()
+        self.page = 0
+        self.rows_per_page = 3
+        self.orders_version = -1
+        self.refresh_pending = False
+        self.prep_model = PrepModel()
+        self.prep_model_loaded = False
+        self.ready_times = {}
+        self.queue = KitchenQueue(estimator=lambda o: self.prep_model.estimate(o), station=station)
+        self.visible_orders = ()
+        self.redraw_pending = False
+        self.suspended = False
+        self.stale = False
         
         self.header = tk.Frame(self, bg=BG_COLOR, height=60)
         self.header.pack(fill="x", padx=20, pady=10)
-        tk.Label(self.header, text="Kitchen Display - Active Orders", font=("Segoe UI", 16, "bold"), bg=BG_COLOR, fg="#FFFFFF").pack(anchor="w")
+        header_text = f"{station.title()} Station - Active Orders" if station else "Kitchen Display - Active Orders"
+        tk.Label(self.header, text=header_text, font=("Segoe UI", 16, "bold"), bg=BG_COLOR, fg="#FFFFFF").pack(side="left")
+        self.build_page_controls()
 
         self.grid_frame = tk.Frame(self, bg=BG_COLOR)
         self.grid_frame.pack(fill="both", expand=True, padx=20, pady=20)
+        self.grid_frame.bind("<Configure>", self.on_board_resize)
         
-        for i in range(4):
-            self.grid_frame.columnconfigure(i, weight=1)
+        if self.low_power:
+            self.ticket_canvas = TicketCanvas(self.grid_frame)
+        else:
+            for i in range(TICKET_COLUMNS):
+                self.grid_frame.columnconfigure(i, weight=1)
         
-        self.load_and_display_orders()
-        self.start_refresh_timer()
+        self.loader = BackgroundLoader(self, self.display_orders)
+        self.bind("<Map>", self.on_map)
+        self.bind("<Unmap>", self.on_unmap)
+        self.after_idle(self.check_visibility)
+        self.on_orders_changed()
+        self.start_order_watch()
         
 
     def load_background(self):
@@ -55,119 +271,164 @@ class KitchenDashboard(tk.Toplevel):
                 print(f"Error loading background: {e}")
 
 
-    def start_refresh_timer(self):
-        self.after(1000, self.load_and_display_orders) 
+    def build_page_controls(self):
+        controls = tk.Frame(self.header, bg=BG_COLOR)
+        controls.pack(side="right")
 
-    def load_and_display_orders(self):
-        orders = [o for o in load_orders() if o.status in [OrderClass.PENDING, OrderClass.PROCESSING]]
-        active_ids = set(o.order_id for o in orders)
-        
-        for order_id in list(self.order_widgets.keys()):
-            if order_id not in active_ids:
-                self.order_widgets[order_id].destroy()
-                del self.order_widgets[order_id]
-                if order_id in self.last_statuses:
-                    del self.last_statuses[order_id]
+        self.prev_btn = tk.Button(controls, text="< PREV", font=("Segoe UI", 10, "bold"), bg=CARD_COLOR, fg="white",
+                                  relief="flat", command=lambda: self.show_page(self.page - 1))
+        self.prev_btn.pack(side="left", padx=5)
 
-        for i, order in enumerate(orders):
-            row, col = divmod(i, 4)
-            current_status = order.status
-            prev_status = self.last_statuses.get(order.order_id)
-            
-            if order.order_id not in self.order_widgets:
-                self.create_ticket_frame(row, col, order)
-                self.last_statuses[order.order_id] = current_status
-            
-            elif current_status != prev_status:
-                container = self.order_widgets[order.order_id]
-                self.render_ticket_content(container, order, is_new=False)
-                self.last_statuses[order.order_id] = current_status
-                container.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
-            
-            else:
-                container = self.order_widgets[order.order_id]
-                container.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
-
-        self.start_refresh_timer()
-
-    def change_order_status(self, order_id, new_status):
-        orders = load_orders()
-        for i, order in enumerate(orders):
-            if order.order_id == order_id:
-                if order.update_status(new_status):
-                    if new_status == OrderClass.COMPLETED:
-                        try:
-                            receipt = Receipt(order)
-                            filename = receipt.save_to_file()
-                            print(f"Receipt generated: {filename}")
-                        except ValueError as e:
-                            print(f"Error generating receipt: {e}")
-                        save_order(order)
-                    else:
-                        save_order(order)
-                    
-                    self.load_and_display_orders()
-                    return
-        print(f"Error: Could not find order {order_id}")
-
-    def create_ticket_frame(self, row, col, order, is_new=False):
-        container = tk.Frame(self.grid_frame, padx=2, pady=2)
-        container.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
-        self.order_widgets[order.order_id] = container
-        self.render_ticket_content(container, order, is_new)
-
-    def render_ticket_content(self, container, order: OrderClass, is_new: bool):
-        for widget in container.winfo_children():
-            widget.destroy()
-
-        border_color = "white"
-        if order.status == OrderClass.PENDING: border_color = STATUS_PENDING
-        elif order.status == OrderClass.PROCESSING: border_color = STATUS_PREP
-        elif order.status == OrderClass.COMPLETED: border_color = STATUS_READY
-        
-        if is_new:
-            border_color = "#FF00FF"
-            
-        container.configure(bg=border_color)
+        self.page_label = tk.Label(controls, text="Page 1 / 1", font=("Segoe UI", 11), bg=BG_COLOR, fg="#CCC")
+        self.page_label.pack(side="left", padx=10)
+
+        self.next_btn = tk.Button(controls, text="NEXT >", font=("Segoe UI", 10, "bold"), bg=CARD_COLOR, fg="white",
+                                  relief="flat", command=lambda: self.show_page(self.page + 1))
+        self.next_btn.pack(side="left", padx=5)
+
+    def on_board_resize(self, event):
+        rows = max(1, event.height // TICKET_ROW_HEIGHT)
+        if rows != self.rows_per_page:
+            self.rows_per_page = rows
+            self.show_page(self.page)
+        elif self.low_power:
+            self.request_redraw()
+
+    def check_visibility(self):
+        self.suspended = self.state() == "withdrawn"
+        if self.suspended:
+            self.loader.pause()
+
+    def on_map(self, event):
+        if event.widget is not self:
+            return
+        self.suspended = False
+        self.loader.resume()
+        if self.low_power:
+            self.request_redraw()
+        if self.stale:
+            self.stale = False
+            self.on_orders_changed()
+
+    def on_unmap(self, event):
+        if event.widget is self:
+            self.suspended = True
+            self.loader.pause()
 
-        card = tk.Frame(container, bg=CARD_COLOR, width=280, height=220)
-        card.pack(fill="both", expand=True)
-        card.pack_propagate(False)
+    def start_order_watch(self):
+        watch_orders(self.on_orders_changed)
 
-        tk.Label(card, text=f"Order #{order.order_id[-4:]}", font=("Segoe UI", 9), bg=CARD_COLOR, fg="#CCC").place(x=15, y=10)
+    def on_orders_changed(self):
+        # a hidden board just remembers it is stale and reloads once it is shown again
+        if self.suspended:
+            self.stale = True
+            return
+        if self.refresh_pending:
+            return
+        self.refresh_pending = True
+        self.loader.submit(self.load_snapshot)
 
-        if order.status == OrderClass.PENDING:
-            next_status = OrderClass.PROCESSING
-            next_text = "START PREP"
-            btn_bg = STATUS_PREP 
+    def load_snapshot(self):
+        self.refresh_pending = False
+        if not self.prep_model_loaded:
+            self.prep_model = build_prep_model()
+            self.prep_model_loaded = True
+        changes = load_orders_since(self.orders_version)
+        self.orders_version = changes.version
+        if not changes.orders and not changes.reset:
+            return None
+        if changes.reset:
+            self.queue.reset(o.materialize() for o in get_active_orders(self.station))
         else:
-            next_status = OrderClass.COMPLETED
-            next_text = "COMPLETE"
-            btn_bg = STATUS_READY 
-        
-        btn_cmd = lambda oid=order.order_id, ns=next_status: self.change_order_status(oid, ns)
-        
-        action_btn = tk.Button(card, text=next_text, font=("Segoe UI", 10, "bold"), 
-                               bg=btn_bg, fg="white", relief="flat", command=btn_cmd)
-        action_btn.place(x=180, y=10, width=90, height=25)
+            orders = [o.materialize() for o in changes.orders]
+            self.prep_model.observe_orders(orders)
+            self.queue.apply(orders)
+        orders = tuple(self.queue.ordered())
+        return orders, {o.order_id: self.prep_model.ready_time(o) for o in orders}
+
+    def display_orders(self, snapshot):
+        self.active_orders, self.ready_times = snapshot
+        self.show_page(self.page)
+
+    def show_page(self, page):
+        page_size = self.rows_per_page * TICKET_COLUMNS
+        page_count = max(1, -(-len(self.active_orders) // page_size))
+        self.page = min(max(page, 0), page_count - 1)
 
-        tk.Label(card, text=order.customer_id, font=("Segoe UI", 24, "bold"), bg=CARD_COLOR, fg="white").place(x=15, y=30)
+        start = self.page * page_size
+        visible = self.active_orders[start:start + page_size]
+        self.visible_orders = visible
+        if self.low_power:
+            self.request_redraw()
+        else:
+            self.render_tickets(visible)
+
+        self.page_label.config(text=f"Page {self.page + 1} / {page_count}  ({len(self.active_orders)} orders)")
+        self.prev_btn.config(state="normal" if self.page > 0 else "disabled")
+        self.next_btn.config(state="normal" if self.page < page_count - 1 else "disabled")
 
-        item_list = [f"{item.quantity}x {item.name}" for item in order.items]
-        items_text = "\n".join(item_list[:4]) + ("..." if len(item_list) > 4 else "")
-        tk.Label(card, text=items_text, font=("Segoe UI", 10), bg=CARD_COLOR, fg="#EEE", justify="left").place(x=15, y=80)
+    def request_redraw(self):
+        if self.redraw_pending:
+            return
+        self.redraw_pending = True
+        self.after(FRAME_INTERVAL_MS, self.redraw)
 
-        time_val = order.created_at.strftime('%H:%M')
-        tk.Label(card, text=time_val, font=("Segoe UI", 18, "bold"), bg=CARD_COLOR, fg="white").place(x=200, y=85)
+    def redraw(self):
+        self.redraw_pending = False
+        if self.suspended:
+            self.stale = True
+            return
+        self.ticket_canvas.draw(self.visible_orders, self.change_order_status, self.station, self.ready_times)
 
-        status_lbl = tk.Label(card, text=order.status, font=("Segoe UI", 10, "bold"), 
-                              bg=border_color, fg="black" if order.status=="Pending" else "white", width=15, pady=5)
-        status_lbl.place(x=80, y=170)
+    def render_tickets(self, visible):
+        visible_ids = set(o.order_id for o in visible)
         
-        container.update_idletasks()
+        for order_id in list(self.order_widgets.keys()):
+            if order_id not in visible_ids:
+                self.release_ticket(order_id)
+
+        for i, order in enumerate(visible):
+            ticket = self.order_widgets.get(order.order_id)
+            if ticket is None:
+                ticket = self.acquire_ticket(order.order_id)
+            ticket.render(order, self.change_order_status, station=self.station,
+                          ready_at=self.ready_times.get(order.order_id))
+            ticket.place_at(*divmod(i, TICKET_COLUMNS))
+
+    def acquire_ticket(self, order_id):
+        ticket = self.ticket_pool.pop() if self.ticket_pool else TicketCard(self.grid_frame)
+        self.order_widgets[order_id] = ticket
+        return ticket
+
+    def release_ticket(self, order_id):
+        ticket = self.order_widgets.pop(order_id)
+        ticket.hide()
+        if len(self.ticket_pool) < TICKET_POOL_SIZE:
+            self.ticket_pool.append(ticket)
+        else:
+            ticket.destroy()
+
+    def change_order_status(self, order_id, expected_status, new_status):
+        self.loader.submit(lambda: self.apply_status_change(order_id, expected_status, new_status))
+
+    def apply_status_change(self, order_id, expected_status, new_status):
+        result = transition_order(order_id, expected_status, new_status, self.station)
+        if result.outcome != TRANSITION_APPLIED:
+            print(f"Status change for {order_id} rejected: {result.outcome}")
+            return self.load_snapshot()
+
+        order = result.order
+        if order.status == OrderClass.COMPLETED:
+            try:
+                receipt = Receipt(order)
+                filename = receipt.save_to_file()
+                print(f"Receipt generated: {filename}")
+            except ValueError as e:
+                print(f"Error generating receipt: {e}")
+        return self.load_snapshot()
 
 if __name__ == "__main__":
     root = tk.Tk()
     root.withdraw()
-    app = KitchenDashboard()
+    app = KitchenDashboard(station=sys.argv[1] if len(sys.argv) > 1 else None)
     root.mainloop()
\ No newline at end of file
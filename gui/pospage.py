@@ -4,7 +4,10 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from backend.menuitem import load_menu_items
-from backend.order import Order, save_order 
+from backend.order import Order, save_order, load_orders_since, watch_orders, get_order_store
+from backend.station import build_station_index, route_order
+from backend.prepmodel import PrepModel, build_prep_model
+from gui.backgroundloader import BackgroundLoader
 
 BG_COLOR = "#2B0505"        
 SECTION_BG = "#550a0a"     
@@ -24,6 +27,8 @@ class POSDashboard(tk.Toplevel):
         self.menu_data = {} 
         self.organize_menu_data()
         self.selected_product_id = None
+        self.prep_model = PrepModel()
+        self.orders_version = None
 
         self.bg_photo = None
         self.bg_label = tk.Label(self, bg=BG_COLOR)
@@ -52,6 +57,10 @@ class POSDashboard(tk.Toplevel):
         self.frame_checkout.pack(side="right", fill="y", padx=(5, 20), pady=20)
         self.frame_checkout.pack_propagate(False)
         self.build_checkout_section()
+
+        self.loader = BackgroundLoader(self, self.set_prep_model)
+        self.loader.submit(self.load_prep_model)
+        watch_orders(self.on_orders_changed)
         
 
     def load_background(self):
@@ -66,6 +75,7 @@ class POSDashboard(tk.Toplevel):
 
     def organize_menu_data(self):
         self.menu_data = {}
+        self.station_index = build_station_index(self.menu_items or [])
         if not self.menu_items:
             return
         for item in self.menu_items:
@@ -79,6 +89,7 @@ class POSDashboard(tk.Toplevel):
             self.menu_items = load_menu_items()
             self.organize_menu_data()
             self.build_menu_section()
+            self.loader.submit(self.load_prep_model)
             messagebox.showinfo("Success", "Menu updated from database!", parent=self)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to refresh menu: {e}", parent=self)
@@ -191,6 +202,7 @@ class POSDashboard(tk.Toplevel):
             return
 
         self.current_order.customer_id = f"Table {table_num}"
+        route_order(self.current_order, self.station_index)
         self.current_order.update_status(Order.PENDING)
 
         save_order(self.current_order)
@@ -264,6 +276,35 @@ class POSDashboard(tk.Toplevel):
         self.lbl_tax_val.config(text=f"${tax:.2f}")
         self.lbl_total_val.config(text=f"${total:.2f}")
 
+        if self.current_order.items:
+            minutes = round(self.prep_model.estimate(self.current_order) / 60)
+            self.lbl_ready_val.config(text=f"~{minutes} min")
+        else:
+            self.lbl_ready_val.config(text="--")
+
+    def load_prep_model(self):
+        model = build_prep_model()
+        self.prep_model = model
+        self.orders_version = get_order_store().get_version()
+        return model
+
+    def on_orders_changed(self):
+        self.loader.submit(self.observe_completed_orders)
+
+    def observe_completed_orders(self):
+        # orders completed since the last rebuild feed the estimates straight away
+        if self.orders_version is None:
+            return None
+        changes = load_orders_since(self.orders_version)
+        self.orders_version = changes.version
+        observed = len(self.prep_model.observed)
+        self.prep_model.observe_orders(changes.orders)
+        return self.prep_model if len(self.prep_model.observed) != observed else None
+
+    def set_prep_model(self, model):
+        self.prep_model = model
+        self.update_totals()
+
     def build_checkout_section(self):
         tk.Label(self.frame_checkout, text="CHECKOUT", font=("Segoe UI", 14, "bold"), bg=SECTION_BG, fg="white").pack(pady=(0, 20))
 
@@ -273,6 +314,7 @@ class POSDashboard(tk.Toplevel):
         tk.Frame(self.frame_checkout, bg="white", height=2).pack(fill="x", pady=20)
         
         self.lbl_total_val = self.add_total_row("Total:", "$0.00", 22, bold=True)
+        self.lbl_ready_val = self.add_total_row("Est. Ready:", "--", 14)
 
         btn_send = tk.Button(self.frame_checkout, text="SEND TO\nKITCHEN", bg="#CC3333", fg="white",
                          font=("Segoe UI", 16, "bold"), relief="flat", height=3, cursor="hand2",
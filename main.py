@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import messagebox 
 import os
 import sys
+import multiprocessing
 from gui.loginpage import open_login_window
 from gui.pospage import POSDashboard
 from gui.kitchenpage import KitchenDashboard
@@ -188,5 +189,6 @@ class SmartChefApp(tk.Tk):
             self.after(200, force_lift)
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     app = SmartChefApp()
     app.mainloop()
\ No newline at end of file
@@ -0,0 +1,250 @@
+import argparse
+import asyncio
+import json
+from urllib.parse import urlsplit, parse_qs
+from backend.order import (
+    get_order_store, Order, TRANSITION_APPLIED, TRANSITION_CONFLICT, TRANSITION_NOT_FOUND
+)
+from backend.receipt import Receipt
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+HEARTBEAT_INTERVAL = 15
+
+ACTIONS = {
+    "start": (Order.PENDING, Order.PROCESSING),
+    "bump": (Order.PROCESSING, Order.COMPLETED),
+}
+
+OUTCOME_CODES = {
+    TRANSITION_APPLIED: 200,
+    TRANSITION_CONFLICT: 409,
+    TRANSITION_NOT_FOUND: 404,
+}
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 409: "Conflict"}
+
+DISPLAY_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>SmartChef - Kitchen Display</title>
+<style>
+body { background: #2B0505; color: #FFF; font-family: "Segoe UI", sans-serif; margin: 20px; }
+#board { display: grid; grid-template-columns: repeat(auto-fill, minmax(260px, 1fr)); gap: 16px; }
+.ticket { background: #450A0A; border: 3px solid #FFC107; padding: 12px; }
+.ticket.PROCESSING { border-color: #0D6EFD; }
+.customer { font-size: 24px; font-weight: bold; }
+.meta { color: #CCC; font-size: 12px; }
+button { margin-top: 10px; width: 100%; padding: 8px; border: 0; color: #FFF; font-weight: bold; }
+.start { background: #0D6EFD; } .bump { background: #198754; }
+</style>
+</head>
+<body>
+<h2 id="title">Kitchen Display - Active Orders</h2>
+<div id="board"></div>
+<script>
+const params = new URLSearchParams(location.search);
+const station = params.get("station");
+const suffix = station ? "?station=" + encodeURIComponent(station) : "";
+if (station) document.getElementById("title").textContent = station + " Station - Active Orders";
+
+function render(orders) {
+  const board = document.getElementById("board");
+  board.innerHTML = "";
+  for (const order of orders) {
+    const action = order.status === "PENDING" ? "start" : "bump";
+    const card = document.createElement("div");
+    card.className = "ticket " + order.status;
+    card.innerHTML = '<div class="meta"></div><div class="customer"></div><pre></pre><button></button>';
+    card.querySelector(".meta").textContent = "Order #" + order.order_id.slice(-4) + " - " + order.created_at.slice(11, 16);
+    card.querySelector(".customer").textContent = order.customer_id;
+    card.querySelector("pre").textContent = order.items.map(i => i.quantity + "x " + i.name).join("\\n");
+    const button = card.querySelector("button");
+    button.className = action;
+    button.textContent = action === "start" ? "START PREP" : "COMPLETE";
+    button.onclick = () => fetch("/orders/" + order.order_id + "/" + action + suffix, {method: "POST"});
+    board.appendChild(card);
+  }
+}
+
+const events = new EventSource("/events" + suffix);
+events.addEventListener("orders", e => render(JSON.parse(e.data)));
+</script>
+</body>
+</html>
+"""
+
+
+def order_payload(order: Order, station: str = None):
+    items = order.items_for_station(station) if station else order.items
+    return {
+        "order_id": order.order_id,
+        "customer_id": order.customer_id,
+        "status": order.stations.get(station, order.status) if station else order.status,
+        "created_at": order.created_at.isoformat(),
+        "items": [item.to_dict() for item in items],
+    }
+
+
+class KitchenServer:
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        self.host = host
+        self.port = port
+        self.store = get_order_store()
+        self.version = -1
+        self.snapshots = {}
+        self.clients = {}
+        self.changed = None
+        self.loop = None
+
+    async def run(self):
+        self.loop = asyncio.get_running_loop()
+        self.changed = asyncio.Event()
+        self.changed.set()
+        self.store.watch(lambda: self.loop.call_soon_threadsafe(self.changed.set))
+
+        server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        print(f"SmartChef kitchen server on http://{self.host}:{self.port}/")
+        async with server:
+            await asyncio.gather(server.serve_forever(), self.broadcast_changes())
+
+    def load_snapshot(self, station: str = None):
+        orders = sorted(self.store.get_active_orders(station), key=lambda o: o.created_at)
+        return json.dumps([order_payload(order, station) for order in orders])
+
+    def refresh_snapshots(self, stations):
+        changes = self.store.load_orders_since(self.version)
+        self.version = changes.version
+        if not changes.orders and not changes.reset:
+            return None
+        return {station: self.load_snapshot(station) for station in stations}
+
+    async def snapshot(self, station: str = None) -> str:
+        payload = self.snapshots.get(station)
+        if payload is None:
+            payload = await self.loop.run_in_executor(None, self.load_snapshot, station)
+            self.snapshots[station] = payload
+        return payload
+
+    async def broadcast_changes(self):
+        while True:
+            await self.changed.wait()
+            self.changed.clear()
+            stations = {station for station, _ in self.clients.values()} | {None}
+            snapshots = await self.loop.run_in_executor(None, self.refresh_snapshots, stations)
+            if snapshots is None:
+                continue
+            self.snapshots = snapshots
+            for station, queue in list(self.clients.values()):
+                payload = await self.snapshot(station)
+                # a slow client only ever needs the newest board
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(payload)
+
+    async def handle_client(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            if not request_line:
+                return
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            length = int(headers.get("content-length", 0))
+            if length:
+                await reader.readexactly(length)
+
+            url = urlsplit(target)
+            station = parse_qs(url.query).get("station", [None])[0]
+            await self.route(method, url.path.rstrip("/") or "/", station, writer)
+        except (ValueError, ConnectionError, asyncio.IncompleteReadError) as e:
+            print(f"Kitchen server request error: {e}")
+        finally:
+            writer.close()
+
+    async def route(self, method: str, path: str, station: str, writer):
+        parts = path.strip("/").split("/")
+        if path == "/" and method == "GET":
+            await self.respond(writer, 200, DISPLAY_PAGE.encode(), "text/html; charset=utf-8")
+        elif path == "/orders" and method == "GET":
+            await self.respond(writer, 200, (await self.snapshot(station)).encode(), "application/json")
+        elif path == "/events" and method == "GET":
+            await self.stream_events(writer, station)
+        elif len(parts) == 3 and parts[0] == "orders" and parts[2] in ACTIONS:
+            if method != "POST":
+                await self.respond_json(writer, 405, {"error": "use POST"})
+            else:
+                await self.apply_action(writer, parts[1], parts[2], station)
+        else:
+            await self.respond_json(writer, 404, {"error": f"no route for {method} {path}"})
+
+    async def apply_action(self, writer, order_id: str, action: str, station: str):
+        expected_status, new_status = ACTIONS[action]
+        result = await self.loop.run_in_executor(
+            None, self.store.transition, order_id, expected_status, new_status, station
+        )
+        if result.outcome == TRANSITION_APPLIED and result.order.status == Order.COMPLETED:
+            try:
+                filename = Receipt(result.order).save_to_file()
+                print(f"Receipt generated: {filename}")
+            except ValueError as e:
+                print(f"Error generating receipt: {e}")
+
+        body = {"outcome": result.outcome}
+        if result.order is not None:
+            body["order"] = order_payload(result.order, station)
+        self.changed.set()
+        await self.respond_json(writer, OUTCOME_CODES.get(result.outcome, 400), body)
+
+    async def stream_events(self, writer, station: str):
+        queue = asyncio.Queue(maxsize=1)
+        queue.put_nowait(await self.snapshot(station))
+        self.clients[writer] = (station, queue)
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Connection: keep-alive\r\n\r\n"
+        )
+        try:
+            while True:
+                try:
+                    payload = await asyncio.wait_for(queue.get(), HEARTBEAT_INTERVAL)
+                    writer.write(f"event: orders\ndata: {payload}\n\n".encode())
+                except asyncio.TimeoutError:
+                    writer.write(b": keep-alive\n\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.pop(writer, None)
+
+    async def respond_json(self, writer, code: int, body):
+        await self.respond(writer, code, json.dumps(body).encode(), "application/json")
+
+    async def respond(self, writer, code: int, body: bytes, content_type: str):
+        writer.write(
+            f"HTTP/1.1 {code} {REASONS.get(code, 'OK')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the SmartChef kitchen display over HTTP/SSE.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+    try:
+        asyncio.run(KitchenServer(args.host, args.port).run())
+    except KeyboardInterrupt:
+        print("Kitchen server stopped.")